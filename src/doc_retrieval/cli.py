@@ -34,6 +34,14 @@ app = typer.Typer(
 console = Console()
 
 
+async def _run_interactive(extractor: InteractiveExtractor, url: str) -> AppConfig | None:
+    """Run the interactive flow, closing its HTTP client before the loop ends."""
+    try:
+        return await extractor.run(url)
+    finally:
+        await InteractiveExtractor.aclose()
+
+
 def version_callback(value: bool):
     if value:
         console.print(f"doc-retrieval version {__version__}")
@@ -165,7 +173,7 @@ def extract(
     if interactive:
         try:
             extractor = InteractiveExtractor(console)
-            config = asyncio.run(extractor.run(url))
+            config = asyncio.run(_run_interactive(extractor, url))
             if config:
                 orchestrator = Orchestrator(config, console)
                 asyncio.run(orchestrator.run())
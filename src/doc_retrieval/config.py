@@ -43,6 +43,14 @@ class FetcherConfig(BaseModel):
     wait_time_ms: int = Field(default=0, ge=0, le=30000)
     click_tabs_selector: str | None = None
     page_pool_size: int = Field(default=5, ge=1, le=20)
+    # Replace a pooled page / the whole browser context after this many
+    # fetches to bound renderer and driver memory growth (0 disables)
+    page_recycle_after: int = Field(default=50, ge=0)
+    context_recycle_after: int = Field(default=500, ge=0)
+    # Playwright resource types aborted before download (empty list disables)
+    block_resource_types: list[str] = Field(
+        default_factory=lambda: ["image", "font", "media"]
+    )
 
 
 class ExtractorConfig(BaseModel):
@@ -107,6 +115,10 @@ class RateLimitConfig(BaseModel):
 
     delay_seconds: float = Field(default=0.1, ge=0.0, le=60.0)
     max_concurrent: int = Field(default=5, ge=1, le=20)
+    # Cap per host on top of max_concurrent (0 = no per-host cap)
+    max_concurrent_per_host: int = Field(default=0, ge=0, le=20)
+    # Sliding one-minute cap on request starts (0 = no cap)
+    requests_per_minute: int = Field(default=0, ge=0)
     max_retries: int = Field(default=3, ge=0, le=10)
     retry_base_delay: float = Field(default=1.0, ge=0.1, le=30.0)
 
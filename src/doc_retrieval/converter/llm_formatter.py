@@ -118,6 +118,20 @@ class LLMFormatter:
         site_info: SiteInfo,
     ) -> str:
         """Combine multiple pages into a single document."""
+        header = self.format_combined_header([page.title for page in pages], site_info)
+        return header + "".join(
+            "\n" + self.format_combined_section(page) for page in pages
+        )
+
+    def format_combined_header(
+        self,
+        titles: list[str | None],
+        site_info: SiteInfo,
+    ) -> str:
+        """Format the document header and table of contents for combined output.
+
+        Takes only page titles so callers can stream page bodies separately.
+        """
         parts = []
 
         # Document header
@@ -128,15 +142,15 @@ class LLMFormatter:
         if self.include_metadata:
             parts.append(f"> Documentation extracted from {site_info.base_url}")
             parts.append(f"> Extracted on: {site_info.extracted_at.isoformat()}")
-            parts.append(f"> Total pages: {len(pages)}")
+            parts.append(f"> Total pages: {len(titles)}")
             parts.append("")
 
         # Table of contents
-        if self.include_toc and len(pages) > 1:
+        if self.include_toc and len(titles) > 1:
             parts.append("## Table of Contents")
             parts.append("")
-            for i, page in enumerate(pages, 1):
-                title = page.title or f"Page {i}"
+            for i, page_title in enumerate(titles, 1):
+                title = page_title or f"Page {i}"
                 anchor = self._make_anchor(title)
                 parts.append(f"- [{title}](#{anchor})")
             parts.append("")
@@ -144,24 +158,28 @@ class LLMFormatter:
         parts.append("---")
         parts.append("")
 
-        # Each page
-        for page in pages:
-            if page.api_version:
-                parts.append(f"<!-- Page: {page.url} | api_version: {page.api_version} -->")
-            else:
-                parts.append(f"<!-- Page: {page.url} -->")
+        return "\n".join(parts)
 
-            # Page title — only add if markdown doesn't already start with this H1
-            if page.title:
-                md_first_line = page.markdown.lstrip().split("\n", 1)[0].strip()
-                if md_first_line != f"# {page.title}":
-                    parts.append(f"# {page.title}")
-                    parts.append("")
+    def format_combined_section(self, page: FormattedPage) -> str:
+        """Format one page's section of the combined output."""
+        parts = []
 
-            parts.append(page.markdown)
-            parts.append("")
-            parts.append("---")
-            parts.append("")
+        if page.api_version:
+            parts.append(f"<!-- Page: {page.url} | api_version: {page.api_version} -->")
+        else:
+            parts.append(f"<!-- Page: {page.url} -->")
+
+        # Page title — only add if markdown doesn't already start with this H1
+        if page.title:
+            md_first_line = page.markdown.lstrip().split("\n", 1)[0].strip()
+            if md_first_line != f"# {page.title}":
+                parts.append(f"# {page.title}")
+                parts.append("")
+
+        parts.append(page.markdown)
+        parts.append("")
+        parts.append("---")
+        parts.append("")
 
         return "\n".join(parts)
 
@@ -1,13 +1,15 @@
 """Base class for URL discovery."""
 
-import re
 from abc import ABC, abstractmethod
 from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from urllib.parse import urlparse
 
+import httpx
 from pydantic import BaseModel
 
 from doc_retrieval.config import DiscoveryConfig
+from doc_retrieval.utils.regex_cache import compiled
 
 
 class DiscoveredURL(BaseModel):
@@ -22,12 +24,23 @@ class DiscoveredURL(BaseModel):
 class BaseDiscoverer(ABC):
     """Abstract base class for URL discovery strategies."""
 
-    def __init__(self, base_url: str, config: DiscoveryConfig):
+    def __init__(
+        self,
+        base_url: str,
+        config: DiscoveryConfig,
+        client: httpx.AsyncClient | None = None,
+    ):
         # Keep trailing slash if present - it's important for relative URL resolution
         self.base_url = base_url
         self.config = config
-        self._include_re = re.compile(config.include_pattern) if config.include_pattern else None
-        self._exclude_re = re.compile(config.exclude_pattern) if config.exclude_pattern else None
+        # Optional caller-owned client so discovery can reuse its connections
+        self._client = client
+        self._include_re = (
+            compiled(config.include_pattern) if config.include_pattern else None
+        )
+        self._exclude_re = (
+            compiled(config.exclude_pattern) if config.exclude_pattern else None
+        )
 
         # Auto-scope discovery to the base URL's path prefix.
         # For https://example.com/docs/api/v2/, scope = "/docs/api/v2".
@@ -41,6 +54,15 @@ class BaseDiscoverer(ABC):
         """Yield discovered URLs."""
         ...
 
+    @asynccontextmanager
+    async def _http_client(self, **kwargs) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the shared client if one was given, else a temporary one."""
+        if self._client is not None:
+            yield self._client
+            return
+        async with httpx.AsyncClient(**kwargs) as client:
+            yield client
+
     def should_include(self, url: str) -> bool:
         """Check if URL matches path scope and include/exclude patterns."""
         # Check path-prefix scope (skip for root base URLs)
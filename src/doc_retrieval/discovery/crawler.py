@@ -10,7 +10,7 @@ from bs4 import BeautifulSoup
 
 from doc_retrieval.config import DiscoveryConfig
 from doc_retrieval.discovery.base import BaseDiscoverer, DiscoveredURL
-from doc_retrieval.utils.url_utils import is_doc_url, is_same_domain, normalize_url
+from doc_retrieval.utils.url_utils import SameDomainChecker, is_doc_url, normalize_url
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +18,13 @@ logger = logging.getLogger(__name__)
 class CrawlerDiscoverer(BaseDiscoverer):
     """Discover URLs by recursively following links."""
 
-    def __init__(self, base_url: str, config: DiscoveryConfig):
-        super().__init__(base_url, config)
+    def __init__(
+        self,
+        base_url: str,
+        config: DiscoveryConfig,
+        client: httpx.AsyncClient | None = None,
+    ):
+        super().__init__(base_url, config, client)
         self._visited: set[str] = set()
 
     async def discover(self) -> AsyncIterator[DiscoveredURL]:
@@ -28,8 +33,12 @@ class CrawlerDiscoverer(BaseDiscoverer):
         count = 0
         max_pages = self.config.max_pages
         max_depth = self.config.max_depth
+        same_domain = SameDomainChecker(self.base_url)
+        # Normalized URLs already queued; BFS order means the first sighting
+        # of a link is also its shallowest, so later ones can be dropped
+        queued = {normalize_url(self.base_url)}
 
-        async with httpx.AsyncClient(
+        async with self._http_client(
             follow_redirects=True,
             timeout=30.0,
         ) as client:
@@ -57,14 +66,21 @@ class CrawlerDiscoverer(BaseDiscoverer):
                 count += 1
                 yield DiscoveredURL(url=normalized, depth=depth)
 
+                # Children of a max-depth page would all be dropped, so
+                # don't fetch it again just to list them
+                if depth >= max_depth:
+                    continue
+
                 try:
                     links = await self._extract_links(client, url)
                     for link in links:
                         link_normalized = normalize_url(link)
                         if (
-                            link_normalized not in self._visited
-                            and is_same_domain(link, self.base_url)
+                            link_normalized not in queued
+                            and same_domain(link)
+                            and is_doc_url(link)
                         ):
+                            queued.add(link_normalized)
                             queue.append((link, depth + 1))
                 except Exception:
                     logger.debug("Failed to extract links from %s", url, exc_info=True)
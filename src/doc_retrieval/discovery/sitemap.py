@@ -9,7 +9,7 @@ from usp.tree import sitemap_tree_for_homepage  # type: ignore[import-untyped]
 
 from doc_retrieval.config import DiscoveryConfig
 from doc_retrieval.discovery.base import BaseDiscoverer, DiscoveredURL
-from doc_retrieval.utils.url_utils import is_doc_url
+from doc_retrieval.utils.url_utils import is_doc_url, normalize_url
 
 logger = logging.getLogger(__name__)
 
@@ -17,13 +17,21 @@ logger = logging.getLogger(__name__)
 class SitemapDiscoverer(BaseDiscoverer):
     """Discover URLs from sitemap.xml."""
 
-    def __init__(self, base_url: str, config: DiscoveryConfig):
-        super().__init__(base_url, config)
+    def __init__(
+        self,
+        base_url: str,
+        config: DiscoveryConfig,
+        client: httpx.AsyncClient | None = None,
+    ):
+        super().__init__(base_url, config, client)
 
     async def discover(self) -> AsyncIterator[DiscoveredURL]:
         """Parse sitemap and yield documentation URLs."""
         count = 0
         max_pages = self.config.max_pages
+        # Sitemaps often list the same page twice (trailing-slash variants,
+        # overlapping sub-sitemaps); yield each normalized URL once
+        seen: set[str] = set()
 
         try:
             tree = sitemap_tree_for_homepage(self.base_url)
@@ -43,6 +51,11 @@ class SitemapDiscoverer(BaseDiscoverer):
                 if not self.should_include(url):
                     continue
 
+                normalized = normalize_url(url)
+                if normalized in seen:
+                    continue
+                seen.add(normalized)
+
                 count += 1
                 yield DiscoveredURL(
                     url=url,
@@ -54,7 +67,7 @@ class SitemapDiscoverer(BaseDiscoverer):
             # If sitemap fails, try common sitemap locations
             for sitemap_path in ["/sitemap.xml", "/sitemap_index.xml", "/sitemap/"]:
                 try:
-                    async for discovered in self._try_sitemap(sitemap_path, count, max_pages):
+                    async for discovered in self._try_sitemap(sitemap_path, seen):
                         yield discovered
                         count += 1
                         if max_pages > 0 and count >= max_pages:
@@ -65,12 +78,12 @@ class SitemapDiscoverer(BaseDiscoverer):
                     continue
 
     async def _try_sitemap(
-        self, path: str, current_count: int, max_pages: int
+        self, path: str, seen: set[str]
     ) -> AsyncIterator[DiscoveredURL]:
         """Try to fetch and parse a specific sitemap URL."""
         sitemap_url = urljoin(self.base_url, path)
 
-        async with httpx.AsyncClient() as client:
+        async with self._http_client() as client:
             response = await client.get(sitemap_url, follow_redirects=True)
             response.raise_for_status()
 
@@ -90,6 +103,11 @@ class SitemapDiscoverer(BaseDiscoverer):
                     if not self.should_include(url):
                         continue
 
+                    normalized = normalize_url(url)
+                    if normalized in seen:
+                        continue
+                    seen.add(normalized)
+
                     priority_elem = url_elem.find("sm:priority", ns)
                     priority = 0.5
                     if priority_elem is not None and priority_elem.text:
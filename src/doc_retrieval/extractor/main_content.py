@@ -28,12 +28,19 @@ class ContentExtractor:
     def __init__(self, config: ExtractorConfig):
         self.config = config
 
-    def extract(self, html: str, url: str) -> ExtractedContent | None:
-        """Extract main content from HTML."""
+    def extract(
+        self, html: str | bytes, url: str, encoding: str | None = None
+    ) -> ExtractedContent | None:
+        """Extract main content from HTML.
+
+        ``html`` may be the raw response bytes; the first parse decodes them
+        directly (using ``encoding`` when the server declared one), so callers
+        never need to build a decoded copy up front.
+        """
         if not html or len(html.strip()) == 0:
             return None
 
-        cleaned_html = self._pre_clean_html(html)
+        cleaned_html = self._pre_clean_html(html, encoding)
 
         # Try targeted soup extraction first when we have content selectors.
         # Soup preserves spacing and structure better than trafilatura for
@@ -63,14 +70,17 @@ class ContentExtractor:
 
         return content
 
-    def _pre_clean_html(self, html: str) -> str:
+    def _pre_clean_html(self, html: str | bytes, encoding: str | None = None) -> str:
         """Remove navigation, sidebar, and footer elements before extraction.
 
         Applying remove_selectors upfront ensures all extraction methods
         (trafilatura, readability, BeautifulSoup) work with clean HTML
         free of navigation chrome.
         """
-        soup = BeautifulSoup(html, "lxml")
+        if isinstance(html, bytes):
+            soup = BeautifulSoup(html, "lxml", from_encoding=encoding)
+        else:
+            soup = BeautifulSoup(html, "lxml")
         for selector in self.config.remove_selectors:
             for elem in soup.select(selector):
                 elem.decompose()
@@ -1,9 +1,13 @@
 """Base class for page fetchers."""
 
 import asyncio
+import codecs
+import math
 import random
 from abc import ABC, abstractmethod
+from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
+from functools import cached_property, lru_cache
 
 from pydantic import BaseModel
 
@@ -11,18 +15,62 @@ from doc_retrieval.config import FetcherConfig
 
 _MAX_RETRY_DELAY = 60.0  # Never sleep longer than this on a single retry
 
+# Headers carrying the requests left in the server's rate-limit window,
+# and the seconds (or epoch time) until it resets, most specific first
+_RATE_LIMIT_REMAINING_HEADERS = (
+    "x-ratelimit-remaining-requests",
+    "x-ratelimit-remaining",
+    "ratelimit-remaining",
+)
+_RATE_LIMIT_RESET_HEADERS = (
+    "x-ratelimit-reset-requests",
+    "x-ratelimit-reset",
+    "ratelimit-reset",
+)
+# Reset values above this are epoch timestamps rather than delta-seconds
+_EPOCH_THRESHOLD = 1_000_000_000
+
+# Below-500 status codes worth retrying: 429 (rate limited) and 0 (the
+# request never completed — only retried when an error was recorded)
+_RETRYABLE_STATUSES = frozenset({429, 0})
+
+
+@lru_cache(maxsize=256)
+def _parse_retry_after_value(header_value: str) -> float | datetime | None:
+    """Parse a Retry-After value into delta-seconds or an absolute date.
+
+    Dates are returned as-is rather than converted to a delay, so cached
+    entries never go stale.
+    """
+    try:
+        return max(0.0, float(header_value))
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(header_value)
+    except Exception:
+        return None
+
 
 class FetchResult(BaseModel):
     """Result of fetching a page."""
 
     url: str
     final_url: str  # After redirects
-    html: str
+    html_bytes: bytes = b""  # Raw body; parsers can consume this without a decode
+    encoding: str | None = None  # Charset declared by the server, if any
     status_code: int
     error: str | None = None
     retry_after: float | None = None
+    rate_limit_remaining: int | None = None  # Requests left in the server's window
+    rate_limit_reset: float | None = None  # Seconds until that window resets
     attempts: int = 1
 
+    @cached_property
+    def html(self) -> str:
+        """Decoded HTML, computed on first access."""
+        return self.html_bytes.decode(self.encoding or "utf-8", "replace")
+
     @property
     def success(self) -> bool:
         return self.status_code >= 200 and self.status_code < 400 and not self.error
@@ -43,7 +91,7 @@ class BaseFetcher(ABC):
         self, url: str, max_retries: int = 3, base_delay: float = 1.0
     ) -> FetchResult:
         """Fetch with exponential backoff on transient errors."""
-        result = FetchResult(url=url, final_url=url, html="", status_code=0, error="no attempts")
+        result = FetchResult(url=url, final_url=url, status_code=0, error="no attempts")
         for attempt in range(max_retries + 1):
             result = await self.fetch(url)
             result.attempts = attempt + 1
@@ -68,29 +116,69 @@ class BaseFetcher(ABC):
         """
         if not header_value:
             return None
+        value = _parse_retry_after_value(header_value)
+        if not isinstance(value, datetime):
+            return value
         try:
-            return max(0.0, float(header_value))
-        except ValueError:
-            pass
-        try:
-            from datetime import datetime, timezone
+            delta = (value - datetime.now(timezone.utc)).total_seconds()
+        except TypeError:  # naive datetime from a malformed date
+            return None
+        return max(0.0, delta)
+
+    @staticmethod
+    def _parse_rate_limit(headers) -> tuple[int | None, float | None]:
+        """Read the remaining-requests count and reset delay from headers.
 
-            dt = parsedate_to_datetime(header_value)
-            delta = (dt - datetime.now(timezone.utc)).total_seconds()
-            return max(0.0, delta)
-        except Exception:
+        Understands the common ``X-RateLimit-*`` headers and the IETF
+        ``RateLimit-*`` draft. Either value is None when absent or malformed.
+        """
+        remaining = reset = None
+        for name in _RATE_LIMIT_REMAINING_HEADERS:
+            value = headers.get(name)
+            if value is not None:
+                try:
+                    remaining = int(float(value))
+                except (ValueError, OverflowError):
+                    pass
+                break
+        for name in _RATE_LIMIT_RESET_HEADERS:
+            value = headers.get(name)
+            if value is not None:
+                try:
+                    reset = float(value.rstrip("s"))
+                except ValueError:
+                    break
+                if not math.isfinite(reset):
+                    reset = None
+                    break
+                if reset > _EPOCH_THRESHOLD:
+                    reset -= datetime.now(timezone.utc).timestamp()
+                reset = max(0.0, reset)
+                break
+        return remaining, reset
+
+    @staticmethod
+    def _parse_charset(charset: str | None) -> str | None:
+        """Return the declared charset if Python knows it, else None.
+
+        Servers send names like ``utf8mb4`` or ``x-user-defined`` that
+        ``bytes.decode`` would reject with LookupError.
+        """
+        if not charset:
             return None
+        try:
+            codecs.lookup(charset)
+        except LookupError:
+            return None
+        return charset
 
     @staticmethod
     def _is_retryable(result: FetchResult) -> bool:
         """Check if a failed fetch should be retried."""
-        # Retry on rate-limit or server errors
-        if result.status_code == 429 or result.status_code >= 500:
-            return True
-        # Retry on connection/timeout errors (status_code 0 with an error message)
-        if result.status_code == 0 and result.error:
+        status = result.status_code
+        if status >= 500:
             return True
-        return False
+        return status in _RETRYABLE_STATUSES and (status != 0 or bool(result.error))
 
     @abstractmethod
     async def __aenter__(self):
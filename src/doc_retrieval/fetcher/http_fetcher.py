@@ -41,20 +41,23 @@ class HttpFetcher(BaseFetcher):
                 retry_after = self._parse_retry_after(
                     response.headers.get("retry-after")
                 )
+            remaining, reset = self._parse_rate_limit(response.headers)
 
             return FetchResult(
                 url=url,
                 final_url=str(response.url),
-                html=response.text,
+                html_bytes=response.content,
+                encoding=self._parse_charset(response.charset_encoding),
                 status_code=response.status_code,
                 retry_after=retry_after,
+                rate_limit_remaining=remaining,
+                rate_limit_reset=reset,
             )
 
         except Exception as e:
             return FetchResult(
                 url=url,
                 final_url=url,
-                html="",
                 status_code=0,
                 error=str(e),
             )
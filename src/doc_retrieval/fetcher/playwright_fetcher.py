@@ -2,39 +2,293 @@
 
 import asyncio
 import logging
-
-from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+import weakref
+from collections import deque
+from urllib.parse import urlparse
+
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    CDPSession,
+    Page,
+    Playwright,
+    Route,
+    async_playwright,
+)
 
 from doc_retrieval.config import FetcherConfig
 from doc_retrieval.fetcher.base import BaseFetcher, FetchResult
 
 logger = logging.getLogger(__name__)
 
+# Generic content selectors tried when no pattern wait_selector matches
+_CONTENT_SELECTORS = (
+    "article",
+    "main",
+    '[role="main"]',
+    ".content",
+    ".documentation",
+    ".docs-content",
+    ".markdown-body",
+)
+
+# Longest wait for the network to go quiet after domcontentloaded. Pages
+# that keep polling or streaming are captured as loaded once this passes,
+# rather than holding a worker for the whole navigation timeout.
+_QUIESCENCE_MAX_MS = 5000
+
+# In-page helpers registered once per browser context via add_init_script,
+# so each fetch only issues short evaluate calls instead of shipping (and
+# having V8 recompile) the full scripts every time.
+_JS_HELPERS = """
+window.__dr = {
+    expand(snapshot) {
+        document.querySelectorAll('details:not([open])')
+            .forEach(d => d.setAttribute('open', ''));
+        // Only snapshot pages that actually have code tabs to click
+        if (!snapshot
+                || !document.querySelector('.openapi-tabs__code-container')) {
+            return null;
+        }
+        return document.documentElement.outerHTML;
+    },
+
+    waitForAny(selectors, timeoutMs) {
+        // Resolve with the first selector (in priority order) that
+        // matches a visible element, as soon as one appears, or null
+        // after timeoutMs. Hidden templates and loading shells don't count.
+        const visible = el => el.checkVisibility
+            ? el.checkVisibility() : el.offsetParent !== null;
+        const match = () => selectors.find(
+            s => Array.from(document.querySelectorAll(s)).some(visible));
+        const found = match();
+        if (found) return Promise.resolve(found);
+        return new Promise(resolve => {
+            const obs = new MutationObserver(() => {
+                const hit = match();
+                if (hit) {
+                    obs.disconnect();
+                    clearTimeout(timer);
+                    resolve(hit);
+                }
+            });
+            const timer = setTimeout(() => {
+                obs.disconnect();
+                resolve(null);
+            }, timeoutMs);
+            // Attribute changes too: content is often revealed by toggling
+            // a class, style or the hidden attribute
+            obs.observe(document, {
+                childList: true, subtree: true,
+                attributes: true, attributeFilter: ['class', 'style', 'hidden'],
+            });
+        });
+    },
+
+    async captureTabs(targetLangs, subTabMap) {
+        const containers = document.querySelectorAll(
+            '.openapi-tabs__code-container'
+        );
+        const results = [];
+        // Resolve on the container's first mutation after a click (the
+        // new panel rendering), or after 200ms if nothing changes.
+        const settle = el => new Promise(resolve => {
+            const done = () => {
+                obs.disconnect();
+                clearTimeout(timer);
+                resolve();
+            };
+            const obs = new MutationObserver(done);
+            const timer = setTimeout(done, 200);
+            obs.observe(el, {
+                childList: true,
+                subtree: true,
+                attributes: true,
+                attributeFilter: ['hidden', 'aria-selected'],
+            });
+        });
+
+        for (let ci = 0; ci < containers.length; ci++) {
+            const c = containers[ci];
+            // Level 1: the first tablist holds language tabs
+            const langTablist = c.querySelector('[role="tablist"]');
+            if (!langTablist) continue;
+            const langTabs = langTablist.querySelectorAll(
+                ':scope > [role="tab"]'
+            );
+
+            for (const lang of targetLangs) {
+                let langTab = null;
+                for (const t of langTabs) {
+                    if (t.textContent.trim().toLowerCase() === lang) {
+                        langTab = t;
+                        break;
+                    }
+                }
+                if (!langTab) continue;
+
+                const langSettled = settle(c);
+                langTab.click();
+                await langSettled;
+
+                // Check for level 2 sub-tabs
+                const subs = subTabMap[lang];
+                if (subs && subs.length > 0) {
+                    // Find the nested tabpanel, then its tablist
+                    const langPanel = c.querySelector(
+                        '[role="tabpanel"]'
+                    );
+                    const subTablist = langPanel
+                        ? langPanel.querySelector('[role="tablist"]')
+                        : null;
+
+                    if (subTablist) {
+                        const subTabs = subTablist.querySelectorAll(
+                            ':scope > [role="tab"]'
+                        );
+                        for (const sub of subs) {
+                            let subTab = null;
+                            for (const st of subTabs) {
+                                if (st.textContent.trim()
+                                        .toLowerCase() === sub) {
+                                    subTab = st;
+                                    break;
+                                }
+                            }
+                            if (!subTab) continue;
+
+                            const subSettled = settle(c);
+                            subTab.click();
+                            await subSettled;
+
+                            // Capture the innermost panel
+                            const innerPanel = langPanel
+                                .querySelector('[role="tabpanel"]');
+                            if (innerPanel
+                                    && innerPanel.querySelector('code')
+                            ) {
+                                results.push([
+                                    ci, sub, innerPanel.cloneNode(true)
+                                ]);
+                            }
+                        }
+                    } else {
+                        // No sub-tabs; capture the language panel
+                        const panel = c.querySelector(
+                            '[role="tabpanel"]'
+                        );
+                        if (panel && panel.querySelector('code')) {
+                            results.push([
+                                ci, lang, panel.cloneNode(true)
+                            ]);
+                        }
+                    }
+                } else {
+                    // No sub-tabs expected; capture the panel
+                    const panel = c.querySelector(
+                        '[role="tabpanel"]'
+                    );
+                    if (panel && panel.querySelector('code')) {
+                        results.push([ci, lang, panel.cloneNode(true)]);
+                    }
+                }
+            }
+        }
+        return results;
+    },
+
+    injectTabs(items) {
+        // Panels are detached clones, so no HTML is re-serialized or parsed
+        const containers = document.querySelectorAll(
+            '.openapi-tabs__code-container'
+        );
+        for (const [ci, label, panel] of items) {
+            const div = document.createElement('div');
+            div.className = 'doc-retrieval-captured-tab';
+            div.dataset.tabLabel = label;
+            div.style.display = 'none';
+            div.appendChild(panel);
+            containers[ci].appendChild(div);
+        }
+        return items.length;
+    },
+};
+"""
+
+# Tabs captured by window.__dr.captureTabs (see _click_through_tabs)
+_TARGET_TAB_LANGUAGES = ["curl", "python"]
+_TARGET_SUB_TABS = {"python": ["http.client", "requests"]}
+
+# Capture and re-inject in a single round-trip; the helpers themselves are
+# already compiled in the page, so this is only a short function call.
+_CAPTURE_TABS_CALL = (
+    "async ([langs, subTabs]) =>"
+    " window.__dr.injectTabs(await window.__dr.captureTabs(langs, subTabs))"
+)
+
+
+# Reset a page between fetches without a navigation: stop pending loads and
+# replace the document with an empty one.  The next goto() does the real
+# navigation, so there is no need to wait for an about:blank load event.
+_RESET_PAGE_JS = "() => { window.stop(); document.open(); document.close(); }"
+
+
+class _SharedBrowser:
+    """The Chromium process shared by the open fetchers of one event loop."""
+
+    def __init__(self) -> None:
+        self.playwright: Playwright | None = None
+        self.browser: Browser | None = None
+        self.refs = 0
+        self.lock = asyncio.Lock()
+
 
 class PlaywrightFetcher(BaseFetcher):
     """Fetch pages using Playwright with JavaScript rendering."""
 
+    # One Chromium process per event loop, shared by every open fetcher on
+    # it; each fetcher still gets its own context (user agent, routes,
+    # helpers) and page pool.  Keyed by loop because the browser and lock
+    # can't outlive the asyncio.run() that created them.
+    _shared: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _SharedBrowser] = (
+        weakref.WeakKeyDictionary()
+    )
+
     def __init__(self, config: FetcherConfig):
         super().__init__(config)
-        self._playwright: Playwright | None = None
         self._browser: Browser | None = None
         self._context: BrowserContext | None = None
-        self._page_pool: asyncio.Queue | None = None
+        # Idle pages, used LIFO so the warmest page is reused first.  Taking
+        # a page is a plain pop; the condition is only touched when the pool
+        # is empty and a fetch has to wait for one to come back.
+        self._page_pool: deque[Page] | None = None
+        self._page_available = asyncio.Condition()
         self._pool_size: int = 0
+        self._page_uses: weakref.WeakKeyDictionary[Page, int] = weakref.WeakKeyDictionary()
+        self._context_fetches: int = 0
+        # Pages held back while waiting for in-flight fetches before a
+        # context rotation
+        self._parked_pages: list[Page] = []
+        # Winning fallback content selector per host, tried first next time
+        self._selector_cache: dict[str, str] = {}
+        # In-flight requests per pooled page, fed by listeners attached once
+        # when the page is created (see _track_requests)
+        self._inflight: weakref.WeakKeyDictionary[Page, set] = weakref.WeakKeyDictionary()
+        # One CDP session per pooled page, dropped automatically with the page
+        self._cdp_sessions: weakref.WeakKeyDictionary[Page, CDPSession] = (
+            weakref.WeakKeyDictionary()
+        )
 
     async def __aenter__(self):
         """Initialize Playwright browser and pre-create page pool."""
-        self._playwright = await async_playwright().start()
+        self._browser = await self._acquire_browser()
         try:
-            self._browser = await self._playwright.chromium.launch(headless=True)
-            self._context = await self._browser.new_context(
-                user_agent=self.config.user_agent,
-                viewport={"width": 1280, "height": 720},
+            self._context = await self._new_context()
+            self._page_pool = deque()
+            pages = await asyncio.gather(
+                *(self._new_page() for _ in range(self.config.page_pool_size))
             )
-            self._page_pool = asyncio.Queue()
-            for _ in range(self.config.page_pool_size):
-                page = await self._context.new_page()
-                await self._page_pool.put(page)
+            self._page_pool.extend(pages)
             self._pool_size = self.config.page_pool_size
         except Exception:
             await self.__aexit__(None, None, None)
@@ -44,128 +298,382 @@ class PlaywrightFetcher(BaseFetcher):
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Drain page pool and clean up Playwright resources."""
         if self._page_pool:
-            while not self._page_pool.empty():
-                page = await self._page_pool.get()
-                try:
-                    await page.close()
-                except Exception:
-                    logger.debug("Failed to close page during cleanup", exc_info=True)
+            pages = list(self._page_pool)
+            self._page_pool.clear()
+            results = await asyncio.gather(
+                *(page.close() for page in pages), return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.debug("Failed to close page during cleanup", exc_info=result)
         if self._context:
             await self._context.close()
+            self._context = None
         if self._browser:
-            await self._browser.close()
-        if self._playwright:
-            await self._playwright.stop()
+            self._browser = None
+            await self._release_browser()
+
+    @classmethod
+    async def _acquire_browser(cls) -> Browser:
+        """Take a reference to the loop's shared browser, launching it if needed."""
+        loop = asyncio.get_running_loop()
+        shared = cls._shared.get(loop)
+        if shared is None:
+            shared = cls._shared[loop] = _SharedBrowser()
+        async with shared.lock:
+            if shared.browser is None:
+                playwright = await async_playwright().start()
+                try:
+                    browser = await playwright.chromium.launch(headless=True)
+                except Exception:
+                    await playwright.stop()
+                    raise
+                shared.playwright = playwright
+                shared.browser = browser
+            shared.refs += 1
+            return shared.browser
+
+    @classmethod
+    async def _release_browser(cls) -> None:
+        """Drop a reference to the shared browser, closing it with the last one."""
+        shared = cls._shared.get(asyncio.get_running_loop())
+        if shared is None:
+            return
+        async with shared.lock:
+            shared.refs -= 1
+            if shared.refs > 0:
+                return
+            browser, shared.browser = shared.browser, None
+            playwright, shared.playwright = shared.playwright, None
+            if browser:
+                await browser.close()
+            if playwright:
+                await playwright.stop()
+
+    async def _new_context(self) -> BrowserContext:
+        """Create a browser context with the page helpers installed."""
+        assert self._browser is not None
+        context = await self._browser.new_context(
+            user_agent=self.config.user_agent,
+            viewport={"width": 1280, "height": 720},
+        )
+        await context.add_init_script(_JS_HELPERS)
+
+        # Only HTML and scripts matter for the rendered DOM; skip heavy assets
+        blocked = frozenset(self.config.block_resource_types)
+        if blocked:
+
+            async def block_assets(route: Route) -> None:
+                if route.request.resource_type in blocked:
+                    await route.abort()
+                else:
+                    await route.continue_()
+
+            await context.route("**/*", block_assets)
+        return context
+
+    async def _new_page(self) -> Page:
+        """Open a page with its CDP session attached up front."""
+        assert self._context is not None
+        page = await self._context.new_page()
+        self._track_requests(page)
+        try:
+            self._cdp_sessions[page] = await self._context.new_cdp_session(page)
+        except Exception:
+            logger.debug("Could not open CDP session for page", exc_info=True)
+        return page
 
     async def fetch(self, url: str) -> FetchResult:
         """Fetch a page with JavaScript rendering using pooled pages."""
-        if not self._context or not self._page_pool:
+        if not self._context or self._page_pool is None:
             raise RuntimeError("Fetcher not initialized. Use 'async with' context manager.")
 
-        page = await self._page_pool.get()
+        page = await self._acquire_page()
+        self._page_uses[page] = self._page_uses.get(page, 0) + 1
+        self._context_fetches += 1
+
+        # Anything still listed belongs to the previous navigation
+        inflight = self._inflight.get(page)
+        if inflight:
+            inflight.clear()
+
+        cfg = self.config
+        timeout_ms = cfg.timeout_ms
+        wait_after_ms = cfg.wait_after_load_ms
+        click_tabs = bool(cfg.click_tabs_selector)
         try:
+            # Return from goto as soon as the document response arrives so a
+            # 429/5xx can be handed back to fetch_with_retry without paying
+            # for a full render of the error page.
             response = await page.goto(
                 url,
-                wait_until="networkidle",
-                timeout=self.config.timeout_ms,
+                wait_until="commit",
+                timeout=timeout_ms,
             )
 
             if response is None:
                 return FetchResult(
                     url=url,
                     final_url=url,
-                    html="",
                     status_code=0,
                     error="No response received",
                 )
 
+            remaining, reset = self._parse_rate_limit(response.headers)
+            if response.status == 429 or response.status >= 500:
+                return FetchResult(
+                    url=url,
+                    final_url=page.url,
+                    status_code=response.status,
+                    retry_after=self._parse_retry_after(
+                        response.headers.get("retry-after")
+                    ),
+                    rate_limit_remaining=remaining,
+                    rate_limit_reset=reset,
+                )
+
+            await page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)
+            await self._wait_network_quiescent(
+                page, max_ms=min(timeout_ms, _QUIESCENCE_MAX_MS)
+            )
             await self._wait_for_content(page)
 
             # Detect client-side redirects (SPA navigation, meta refresh).
             # If the URL changed after initial load, re-wait for content
             # on the new page.
-            if page.url != url:
+            final_url = page.url
+            if final_url != url:
                 try:
-                    await page.wait_for_load_state("networkidle", timeout=10000)
+                    await self._wait_network_quiescent(
+                        page, max_ms=min(timeout_ms, _QUIESCENCE_MAX_MS)
+                    )
                     await self._wait_for_content(page)
                 except Exception:
                     logger.debug("Failed to wait for redirected page: %s", url, exc_info=True)
-
-            if self.config.wait_after_load_ms > 0:
-                await asyncio.sleep(self.config.wait_after_load_ms / 1000)
-
-            # Expand all collapsed <details> elements so content is in the DOM
-            await page.evaluate(
-                "document.querySelectorAll('details:not([open])')"
-                ".forEach(d => d.setAttribute('open', ''))"
+                final_url = page.url
+
+            if wait_after_ms > 0:
+                await asyncio.sleep(wait_after_ms / 1000)
+
+            # Expand all collapsed <details> elements so content is in the
+            # DOM, and in the same round-trip capture pre-click HTML as a
+            # safety snapshot.  Tab clicking can crash Docusaurus React
+            # components; if that happens we fall back to the pre-click
+            # content which has valid schema data.
+            pre_click_html = await page.evaluate(
+                "(snapshot) => window.__dr.expand(snapshot)",
+                click_tabs,
             )
 
-            # Capture pre-click HTML as a safety snapshot.  Tab clicking can
-            # crash Docusaurus React components; if that happens we fall back
-            # to the pre-click content which has valid schema data.
-            pre_click_html = await page.content() if self.config.click_tabs_selector else None
-
-            if self.config.click_tabs_selector:
+            # A snapshot is only returned when the page has code tabs
+            if pre_click_html is not None:
                 await self._click_through_tabs(page)
 
-            html = await page.content()
+            html = await self._get_html(page)
 
             if pre_click_html and self._is_crashed_page(html):
                 html = pre_click_html
 
-            retry_after: float | None = None
-            if response.status == 429:
-                retry_after = self._parse_retry_after(
-                    response.headers.get("retry-after")
-                )
-
             return FetchResult(
                 url=url,
-                final_url=page.url,
-                html=html,
+                final_url=final_url,
+                html_bytes=html.encode("utf-8"),
+                encoding="utf-8",
                 status_code=response.status,
-                retry_after=retry_after,
+                rate_limit_remaining=remaining,
+                rate_limit_reset=reset,
             )
 
         except Exception as e:
             return FetchResult(
                 url=url,
                 final_url=url,
-                html="",
                 status_code=0,
                 error=str(e),
             )
         finally:
             await self._return_page_to_pool(page)
 
-    async def _return_page_to_pool(self, page) -> None:
-        """Reset a page and return it to the pool, replacing it if broken."""
+    async def fetch_many(
+        self, urls: list[str], max_concurrency: int | None = None
+    ) -> list[FetchResult]:
+        """Fetch several URLs concurrently, returning results in input order.
+
+        The page pool bounds concurrency on its own; ``max_concurrency``
+        can cap it lower than the pool size.
+        """
+        if not max_concurrency:
+            return list(await asyncio.gather(*(self.fetch(u) for u in urls)))
+
+        sem = asyncio.Semaphore(max_concurrency)
+
+        async def bounded(url: str) -> FetchResult:
+            async with sem:
+                return await self.fetch(url)
+
+        return list(await asyncio.gather(*(bounded(u) for u in urls)))
+
+    async def _acquire_page(self) -> Page:
+        """Take an idle page, waiting for one to be returned if necessary."""
         assert self._page_pool is not None
-        assert self._context is not None
+        if self._page_pool:
+            return self._page_pool.pop()
+        async with self._page_available:
+            await self._page_available.wait_for(lambda: bool(self._page_pool))
+            return self._page_pool.pop()
+
+    async def _release_page(self, page: Page) -> None:
+        """Put a page back in the idle pool and wake one waiting fetch."""
+        assert self._page_pool is not None
+        self._page_pool.append(page)
+        async with self._page_available:
+            self._page_available.notify()
+
+    async def _return_page_to_pool(self, page: Page) -> None:
+        """Reset a page and return it to the pool, replacing it if broken.
+
+        Pages that have served ``page_recycle_after`` fetches are replaced
+        outright, and once the context has served ``context_recycle_after``
+        fetches pages are parked until all are back so it can be rotated.
+        """
+        assert self._page_pool is not None
+        limit = self.config.context_recycle_after
+        if limit and self._context_fetches >= limit:
+            await self._park_for_context_recycle(page)
+            return
+
+        limit = self.config.page_recycle_after
+        if limit and self._page_uses.get(page, 0) >= limit:
+            await self._replace_page(page)
+            return
+
         try:
-            await page.goto("about:blank", wait_until="load", timeout=5000)
-            await self._page_pool.put(page)
+            await page.evaluate(_RESET_PAGE_JS)
+            await self._release_page(page)
         except Exception:
-            # Page is broken — close it and create a fresh replacement
             logger.debug("Page reset failed, replacing page", exc_info=True)
+            await self._replace_page(page)
+
+    async def _replace_page(self, page: Page) -> None:
+        """Close a page and put a fresh one from the current context in the pool."""
+        # The request set can reference the page, so drop it explicitly
+        self._inflight.pop(page, None)
+        try:
+            await page.close()
+        except Exception:
+            logger.debug("Failed to close page", exc_info=True)
+        await self._add_page()
+
+    async def _add_page(self) -> None:
+        """Create a page in the current context, shrinking the pool on failure."""
+        assert self._page_pool is not None
+        assert self._context is not None
+        try:
+            await self._release_page(await self._new_page())
+        except Exception:
+            self._pool_size -= 1
+            logger.warning(
+                "Failed to create replacement page — pool shrunk to %d",
+                self._pool_size,
+                exc_info=True,
+            )
+            if self._pool_size <= 0:
+                raise RuntimeError(
+                    "Playwright page pool is empty — all pages lost"
+                )
+
+    async def _park_for_context_recycle(self, page: Page) -> None:
+        """Hold a page back; rotate the context once every page is parked."""
+        assert self._page_pool is not None
+        self._parked_pages.append(page)
+        self._parked_pages.extend(self._page_pool)
+        self._page_pool.clear()
+        if len(self._parked_pages) < self._pool_size:
+            return
+
+        old_pages, self._parked_pages = self._parked_pages, []
+        self._context_fetches = 0
+        old_context = self._context
+        try:
+            self._context = await self._new_context()
+        except Exception:
+            logger.warning("Failed to rotate browser context", exc_info=True)
+            for old_page in old_pages:
+                await self._release_page(old_page)
+            return
+
+        logger.debug("Rotating browser context (%d pages)", self._pool_size)
+        for old_page in old_pages:
+            self._inflight.pop(old_page, None)
+        if old_context:
             try:
-                await page.close()
-            except Exception:
-                logger.debug("Failed to close broken page", exc_info=True)
-            try:
-                new_page = await self._context.new_page()
-                await self._page_pool.put(new_page)
+                await old_context.close()
             except Exception:
-                self._pool_size -= 1
-                logger.warning(
-                    "Failed to create replacement page — pool shrunk to %d",
-                    self._pool_size,
-                    exc_info=True,
+                logger.debug("Failed to close old browser context", exc_info=True)
+        for _ in range(self._pool_size):
+            await self._add_page()
+
+    async def _wait_network_quiescent(
+        self, page: Page, idle_ms: int = 500, max_ms: int = _QUIESCENCE_MAX_MS
+    ) -> bool:
+        """Wait until no requests have been in flight for ``idle_ms``.
+
+        Unlike ``networkidle`` this ignores long-lived connections such as
+        WebSockets, and gives up after ``max_ms`` instead of raising so a
+        chatty page still gets rendered. Returns whether quiescence was seen.
+        """
+        pending = self._inflight.get(page)
+        if pending is None:
+            pending = self._track_requests(page)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_ms / 1000
+        idle_since = loop.time()
+        while True:
+            now = loop.time()
+            if pending:
+                idle_since = now
+            elif now - idle_since >= idle_ms / 1000:
+                return True
+            if now >= deadline:
+                logger.debug(
+                    "Network not quiescent after %dms (%d pending)",
+                    max_ms,
+                    len(pending),
                 )
-                if self._pool_size <= 0:
-                    raise RuntimeError(
-                        "Playwright page pool is empty — all pages lost"
-                    )
+                return False
+            await asyncio.sleep(0.1)
+
+    def _track_requests(self, page: Page) -> set:
+        """Keep a live set of the page's in-flight requests."""
+        inflight: set = set()
+        page.on("request", inflight.add)
+        page.on("requestfinished", inflight.discard)
+        page.on("requestfailed", inflight.discard)
+        self._inflight[page] = inflight
+        return inflight
+
+    async def _get_html(self, page: Page) -> str:
+        """Serialize the page DOM via CDP ``DOM.getOuterHTML``.
+
+        Skips the extra JSON wrapping ``page.content()`` does on top of the
+        same serialization; falls back to it if the CDP call fails.
+        """
+        assert self._context is not None
+        try:
+            cdp = self._cdp_sessions.get(page)
+            if cdp is None:
+                cdp = await self._context.new_cdp_session(page)
+                self._cdp_sessions[page] = cdp
+            doc = await cdp.send("DOM.getDocument", {"depth": 0})
+            result = await cdp.send(
+                "DOM.getOuterHTML", {"nodeId": doc["root"]["nodeId"]}
+            )
+            return str(result["outerHTML"])
+        except Exception:
+            logger.debug("CDP getOuterHTML failed, using page.content()", exc_info=True)
+            self._cdp_sessions.pop(page, None)
+            return await page.content()
 
     @staticmethod
     def _is_crashed_page(html: str) -> bool:
@@ -186,170 +694,57 @@ class PlaywrightFetcher(BaseFetcher):
         called but is not used as a selector here — the two-level DOM
         traversal uses its own hard-coded selectors.
         """
-        target_languages = ["curl", "python"]
-        target_sub_tabs = {"python": ["http.client", "requests"]}
-
         try:
+            # The injected HTML originates from the page's own rendered DOM
+            # (same-origin), not external input.
             captured = await page.evaluate(
-                """async ([targetLangs, subTabMap]) => {
-                    const containers = document.querySelectorAll(
-                        '.openapi-tabs__code-container'
-                    );
-                    const results = [];
-                    const wait = ms => new Promise(r => setTimeout(r, ms));
-
-                    for (let ci = 0; ci < containers.length; ci++) {
-                        const c = containers[ci];
-                        // Level 1: the first tablist holds language tabs
-                        const langTablist = c.querySelector('[role="tablist"]');
-                        if (!langTablist) continue;
-                        const langTabs = langTablist.querySelectorAll(
-                            ':scope > [role="tab"]'
-                        );
-
-                        for (const lang of targetLangs) {
-                            let langTab = null;
-                            for (const t of langTabs) {
-                                if (t.textContent.trim().toLowerCase() === lang) {
-                                    langTab = t;
-                                    break;
-                                }
-                            }
-                            if (!langTab) continue;
-
-                            langTab.click();
-                            await wait(200);
-
-                            // Check for level 2 sub-tabs
-                            const subs = subTabMap[lang];
-                            if (subs && subs.length > 0) {
-                                // Find the nested tabpanel, then its tablist
-                                const langPanel = c.querySelector(
-                                    '[role="tabpanel"]'
-                                );
-                                const subTablist = langPanel
-                                    ? langPanel.querySelector('[role="tablist"]')
-                                    : null;
-
-                                if (subTablist) {
-                                    const subTabs = subTablist.querySelectorAll(
-                                        ':scope > [role="tab"]'
-                                    );
-                                    for (const sub of subs) {
-                                        let subTab = null;
-                                        for (const st of subTabs) {
-                                            if (st.textContent.trim()
-                                                    .toLowerCase() === sub) {
-                                                subTab = st;
-                                                break;
-                                            }
-                                        }
-                                        if (!subTab) continue;
-
-                                        subTab.click();
-                                        await wait(200);
-
-                                        // Capture the innermost panel
-                                        const innerPanel = langPanel
-                                            .querySelector('[role="tabpanel"]');
-                                        if (innerPanel
-                                                && innerPanel.querySelector('code')
-                                        ) {
-                                            results.push([
-                                                ci, sub, innerPanel.outerHTML
-                                            ]);
-                                        }
-                                    }
-                                } else {
-                                    // No sub-tabs; capture the language panel
-                                    const panel = c.querySelector(
-                                        '[role="tabpanel"]'
-                                    );
-                                    if (panel && panel.querySelector('code')) {
-                                        results.push([
-                                            ci, lang, panel.outerHTML
-                                        ]);
-                                    }
-                                }
-                            } else {
-                                // No sub-tabs expected; capture the panel
-                                const panel = c.querySelector(
-                                    '[role="tabpanel"]'
-                                );
-                                if (panel && panel.querySelector('code')) {
-                                    results.push([ci, lang, panel.outerHTML]);
-                                }
-                            }
-                        }
-                    }
-                    return results;
-                }""",
-                [target_languages, target_sub_tabs],
+                _CAPTURE_TABS_CALL, [_TARGET_TAB_LANGUAGES, _TARGET_SUB_TABS]
             )
-
-            # Inject captured panels as hidden divs so the extractor can read
-            # code samples for every language.  The HTML originates from the
-            # page's own rendered DOM (same-origin), not external input.
-            if captured:
-                await page.evaluate(
-                    """(items) => {
-                        const wrap = document.createElement('div');
-                        const containers = document.querySelectorAll(
-                            '.openapi-tabs__code-container'
-                        );
-                        for (const [ci, label, panelHtml] of items) {
-                            const div = document.createElement('div');
-                            div.className = 'doc-retrieval-captured-tab';
-                            div.dataset.tabLabel = label;
-                            div.style.display = 'none';
-                            wrap.innerHTML = panelHtml;
-                            while (wrap.firstChild) {
-                                div.appendChild(wrap.firstChild);
-                            }
-                            containers[ci].appendChild(div);
-                        }
-                    }""",
-                    captured,
-                )
+            logger.debug("Captured %d code tab panels", captured)
         except Exception:
             logger.debug("Tab click-through failed", exc_info=True)
 
     async def _wait_for_content(self, page) -> None:
         """Wait for main content to be visible."""
         # Try the pattern-configured wait_selector first (highest priority)
-        if self.config.wait_selector:
+        wait_selector = self.config.wait_selector
+        if wait_selector:
             try:
-                await page.wait_for_selector(
-                    self.config.wait_selector, timeout=10000
-                )
+                await page.wait_for_selector(wait_selector, timeout=10000)
                 # Additional wait if the pattern requests it (e.g. for lazy-loaded schema)
-                if self.config.wait_time_ms > 0:
-                    await asyncio.sleep(self.config.wait_time_ms / 1000)
+                wait_time_ms = self.config.wait_time_ms
+                if wait_time_ms > 0:
+                    await asyncio.sleep(wait_time_ms / 1000)
                 return
             except Exception:
                 logger.debug(
                     "Pattern wait_selector '%s' not found, trying fallbacks",
-                    self.config.wait_selector,
+                    wait_selector,
                 )
 
-        # Fall back to generic content selectors
-        selectors = [
-            "article",
-            "main",
-            '[role="main"]',
-            ".content",
-            ".documentation",
-            ".docs-content",
-            ".markdown-body",
-        ]
-
-        for selector in selectors:
-            try:
-                await page.wait_for_selector(selector, timeout=5000)
-                return
-            except Exception:
-                logger.debug("Content selector '%s' not found", selector)
-                continue
+        # Fall back to generic content selectors, starting with whichever
+        # one matched last time on this host (sites use a single layout, so
+        # this bounds the steady-state wait to a single probe).
+        host = urlparse(page.url).netloc
+        cached = self._selector_cache.get(host)
+        selectors: tuple[str, ...] = _CONTENT_SELECTORS
+        if cached:
+            selectors = (cached, *(s for s in _CONTENT_SELECTORS if s != cached))
 
-        # If no specific content found, wait a bit for any JS to complete
-        await asyncio.sleep(0.5)
+        # One in-page observer races all selectors under a single timeout
+        try:
+            matched = await page.evaluate(
+                "([selectors, ms]) => window.__dr.waitForAny(selectors, ms)",
+                [list(selectors), 5000],
+            )
+        except Exception:
+            logger.debug("Content selector wait failed", exc_info=True)
+            matched = None
+        if matched:
+            self._selector_cache[host] = matched
+            return
+        logger.debug("No content selector found on %s", page.url)
+
+        # If no specific content found, give in-flight JS requests a short
+        # window to settle (returns early once the network goes quiet)
+        await self._wait_network_quiescent(page, idle_ms=100, max_ms=500)
@@ -1,8 +1,15 @@
 """Interactive mode for guided documentation extraction."""
 
+import asyncio
+import importlib.util
+import re
 import time as _time
+from collections import Counter
+from collections.abc import Callable
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from urllib.parse import urlparse
+from urllib.parse import urljoin, urlparse
 
 import httpx
 from rich.console import Console
@@ -27,14 +34,112 @@ from doc_retrieval.discovery import (
 )
 from doc_retrieval.discovery.base import BaseDiscoverer
 from doc_retrieval.patterns import PatternRegistry
+from doc_retrieval.utils.regex_cache import compiled
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Markers of client-side rendered pages, matched in a single regex pass
+_JS_INDICATORS = (
+    "__NEXT_DATA__",
+    "__NUXT__",
+    "window.__INITIAL_STATE__",
+    "react-root",
+    "id=\"app\"",
+    "id=\"root\"",
+    "<noscript>",
+)
+_JS_INDICATOR_RE = re.compile("|".join(map(re.escape, _JS_INDICATORS)))
+
+# Framework markers sit in the <head> or early in the body, so site analysis
+# only downloads this much of the landing page
+_ANALYZE_MAX_BYTES = 256 * 1024
+
+# Whether each host has a sitemap, so repeat runs in this process skip the probe
+_SITEMAP_CACHE: dict[str, bool] = {}
+_SITEMAP_PROBE_TIMEOUT = 5.0
+# Sitemap locations probed at the site root and under the start URL; covers
+# the SitemapDiscoverer fallbacks and the common index names usp checks
+_SITEMAP_PROBE_PATHS = (
+    "sitemap.xml",
+    "sitemap_index.xml",
+    "sitemap-index.xml",
+    "sitemap.xml.gz",
+    "sitemap/",
+)
+# Only these statuses say a location definitely has no sitemap; anything
+# else (403, 5xx, ...) leaves the question open
+_SITEMAP_ABSENT_STATUSES = frozenset({404, 410})
+
+# Minimum seconds between discovery status redraws
+_STATUS_INTERVAL = 0.1
+
+
+def _url_path(url: str) -> str:
+    """Return the path of an absolute URL without a full urlparse."""
+    _, _, rest = url.partition("://")
+    _, _, path = rest.partition("/")
+    return path.partition("?")[0].partition("#")[0]
+
+
+def _url_matcher(pattern: str) -> Callable[[str], object]:
+    """Return a search predicate for a user URL filter.
+
+    Patterns without regex metacharacters (e.g. ``/docs/api``) are plain
+    substring checks, which are much cheaper than running the regex engine.
+    """
+    if re.escape(pattern) == pattern:
+        return lambda url: pattern in url
+    return compiled(pattern).search
+
+
+@lru_cache(maxsize=4096)
+def _path_group(path: str) -> str:
+    """Group a path by its first two segments, e.g. ``/docs/api/``."""
+    path = path.strip("/")
+    if not path:
+        return "/"
+    return "/" + "/".join(path.split("/", 2)[:2]) + "/"
 
 
 class InteractiveExtractor:
     """Guide user through documentation extraction interactively."""
 
+    # Pooled client shared by site analysis and discovery across sessions on
+    # the same event loop, so requests to a host reuse open connections
+    _shared_client: httpx.AsyncClient | None = None
+    _client_loop: asyncio.AbstractEventLoop | None = None
+
     def __init__(self, console: Console | None = None):
         self.console = console or Console()
 
+    @classmethod
+    def _get_client(cls) -> httpx.AsyncClient:
+        """Return the shared client, creating it for the running loop if needed."""
+        loop = asyncio.get_running_loop()
+        if cls._shared_client is None or cls._client_loop is not loop:
+            # A client from a previous (closed) loop cannot be reused
+            cls._shared_client = httpx.AsyncClient(
+                follow_redirects=True,
+                timeout=30,
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_keepalive_connections=20,
+                    max_connections=100,
+                    keepalive_expiry=30,
+                ),
+            )
+            cls._client_loop = loop
+        return cls._shared_client
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared HTTP client."""
+        client, cls._shared_client = cls._shared_client, None
+        cls._client_loop = None
+        if client is not None:
+            await client.aclose()
+
     async def run(self, url: str) -> AppConfig | None:
         """Run interactive extraction flow. Returns config if user confirms."""
         self.console.print()
@@ -103,18 +208,28 @@ class InteractiveExtractor:
     async def _analyze_site(self, url: str) -> dict | None:
         """Fetch the site and gather basic info."""
         try:
-            async with httpx.AsyncClient(follow_redirects=True, timeout=30) as client:
-                response = await client.get(url)
+            async with self._get_client().stream("GET", url) as response:
                 response.raise_for_status()
+                chunks: list[bytes] = []
+                size = 0
+                async for chunk in response.aiter_bytes():
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= _ANALYZE_MAX_BYTES:
+                        break
+                # Leaving the block closes the stream, dropping the rest
+                html = b"".join(chunks)[:_ANALYZE_MAX_BYTES].decode(
+                    response.encoding or "utf-8", "replace"
+                )
 
-                return {
-                    "url": url,
-                    "final_url": str(response.url),
-                    "status": response.status_code,
-                    "html": response.text,
-                    "content_length": len(response.text),
-                    "has_trailing_slash": str(response.url).endswith("/"),
-                }
+            return {
+                "url": url,
+                "final_url": str(response.url),
+                "status": response.status_code,
+                "html": html,
+                "content_length": len(html),
+                "has_trailing_slash": str(response.url).endswith("/"),
+            }
         except Exception as e:
             self.console.print(f"[red]Error accessing site: {e}[/red]")
             return None
@@ -176,18 +291,7 @@ class InteractiveExtractor:
                 return Confirm.ask("Enable JavaScript rendering anyway?", default=False)
 
         # Check for signs of JS-rendered content
-        html = site_info["html"]
-        js_indicators = [
-            "__NEXT_DATA__",
-            "__NUXT__",
-            "window.__INITIAL_STATE__",
-            "react-root",
-            "id=\"app\"",
-            "id=\"root\"",
-            "<noscript>",
-        ]
-
-        seems_js = any(indicator in html for indicator in js_indicators)
+        seems_js = _JS_INDICATOR_RE.search(site_info["html"]) is not None
 
         if seems_js:
             self.console.print("[yellow]This site appears to use JavaScript rendering.[/yellow]")
@@ -198,26 +302,9 @@ class InteractiveExtractor:
 
     def _show_url_structure(self, urls: list[DiscoveredURL]) -> None:
         """Analyze and display URL path structure to help with filtering."""
-        from collections import Counter
-        from urllib.parse import urlparse
-
-        path_counts: Counter = Counter()
-
-        for discovered in urls:
-            parsed = urlparse(discovered.url)
-            path = parsed.path.strip("/")
-            if path:
-                # Get first 2-3 path segments for grouping
-                segments = path.split("/")
-                if len(segments) >= 2:
-                    prefix = "/" + "/".join(segments[:2]) + "/"
-                elif len(segments) == 1:
-                    prefix = "/" + segments[0] + "/"
-                else:
-                    prefix = "/"
-                path_counts[prefix] += 1
-            else:
-                path_counts["/"] += 1
+        path_counts: Counter = Counter(
+            _path_group(_url_path(discovered.url)) for discovered in urls
+        )
 
         # Show top path patterns
         self.console.print("\n[bold]URL patterns found:[/bold]")
@@ -245,22 +332,30 @@ class InteractiveExtractor:
 
         self.console.print("  Checking for sitemap...")
         config = DiscoveryConfig(mode=DiscoveryMode.SITEMAP, max_pages=0)
-        discoverer: BaseDiscoverer = SitemapDiscoverer(url, config)
+        discoverer: BaseDiscoverer = SitemapDiscoverer(url, config, self._get_client())
 
-        urls = []
-        try:
-            sitemap_start = _time.monotonic()
-            with self.console.status("Reading sitemap...") as status:
-                async for discovered in discoverer.discover():
-                    urls.append(discovered)
-                    if len(urls) % 50 == 0:
-                        elapsed = _time.monotonic() - sitemap_start
-                        rate = len(urls) / elapsed if elapsed > 0 else 0
-                        status.update(
-                            f"Reading sitemap... found {len(urls)} pages ({rate:.1f}/sec)"
-                        )
-        except Exception:
-            pass
+        urls: list[DiscoveredURL] = []
+        if await self._probe_sitemap(url):
+            try:
+                sitemap_start = _time.monotonic()
+                next_update = sitemap_start + _STATUS_INTERVAL
+                append = urls.append
+                with self.console.status("Reading sitemap...") as status:
+                    async for discovered in discoverer.discover():
+                        append(discovered)
+                        now = _time.monotonic()
+                        if now >= next_update:
+                            next_update = now + _STATUS_INTERVAL
+                            elapsed = now - sitemap_start
+                            rate = len(urls) / elapsed if elapsed > 0 else 0
+                            status.update(
+                                f"Reading sitemap... found {len(urls)} pages ({rate:.1f}/sec)"
+                            )
+            except Exception:
+                pass
+        else:
+            # Skip the full sitemap walk, which tries many locations in turn
+            self.console.print("  [dim]No sitemap advertised[/dim]")
 
         if urls:
             self.console.print(f"  [green]Found {len(urls)} pages via sitemap[/green]")
@@ -278,20 +373,101 @@ class InteractiveExtractor:
             max_depth=max_depth,
             max_pages=max_pages if max_pages > 0 else 0,
         )
-        discoverer = CrawlerDiscoverer(url, config)
+        discoverer = CrawlerDiscoverer(url, config, self._get_client())
 
         urls = []
         crawl_start = _time.monotonic()
+        next_update = crawl_start + _STATUS_INTERVAL
+        append = urls.append
         with self.console.status("Crawling...") as status:
             async for discovered in discoverer.discover():
-                urls.append(discovered)
-                elapsed = _time.monotonic() - crawl_start
-                rate = len(urls) / elapsed if elapsed > 0 else 0
-                status.update(f"Crawling... found {len(urls)} pages ({rate:.1f}/sec)")
+                append(discovered)
+                now = _time.monotonic()
+                if now >= next_update:
+                    next_update = now + _STATUS_INTERVAL
+                    elapsed = now - crawl_start
+                    rate = len(urls) / elapsed if elapsed > 0 else 0
+                    status.update(f"Crawling... found {len(urls)} pages ({rate:.1f}/sec)")
 
         self.console.print(f"  [green]Found {len(urls)} pages via crawling[/green]")
         return DiscoveryMode.CRAWL, urls
 
+    async def _probe_sitemap(self, url: str) -> bool:
+        """Quickly check whether the site advertises a sitemap.
+
+        Requests robots.txt and the usual sitemap locations concurrently.
+        Returns False only when every probe definitely found nothing (a
+        robots.txt without a Sitemap line, 404/410 elsewhere), so slow,
+        failed or refused probes still fall through to the full sitemap walk.
+        """
+        host = urlparse(url).netloc
+        if host in _SITEMAP_CACHE:
+            return _SITEMAP_CACHE[host]
+
+        client = self._get_client()
+        candidates = {
+            urljoin(url, path)
+            for name in _SITEMAP_PROBE_PATHS
+            for path in (f"/{name}", name)
+        }
+
+        # Each probe returns True (sitemap found), False (definitely none
+        # there) or None (no definite answer)
+        async def check_robots() -> bool | None:
+            response = await client.get(urljoin(url, "/robots.txt"))
+            if response.status_code in _SITEMAP_ABSENT_STATUSES:
+                return False
+            if response.status_code != 200:
+                return None
+            for line in response.text.splitlines():
+                key, _, value = line.partition(":")
+                if key.strip().lower() == "sitemap" and value.strip():
+                    return True
+            return False
+
+        async def check_location(sitemap_url: str) -> bool | None:
+            response = await client.head(sitemap_url)
+            if response.status_code == 405:
+                # HEAD not allowed; a streamed GET reads only the headers
+                async with client.stream("GET", sitemap_url) as response:
+                    pass
+            if response.is_success:
+                return True
+            if response.status_code in _SITEMAP_ABSENT_STATUSES:
+                return False
+            return None
+
+        probes = [asyncio.create_task(check_robots())]
+        probes += [asyncio.create_task(check_location(c)) for c in candidates]
+        pending = set(probes)
+        answered = 0
+        try:
+            deadline = _time.monotonic() + _SITEMAP_PROBE_TIMEOUT
+            while pending:
+                remaining = deadline - _time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        continue
+                    found = task.result()
+                    if found:
+                        _SITEMAP_CACHE[host] = True
+                        return True
+                    if found is False:
+                        answered += 1
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if answered < len(probes):
+            return True
+        _SITEMAP_CACHE[host] = False
+        return False
+
     async def _refine_urls(
         self, urls: list[DiscoveredURL]
     ) -> tuple[list[DiscoveredURL], str | None, str | None]:
@@ -304,13 +480,16 @@ class InteractiveExtractor:
 
         # Show sample of URLs
         self.console.print("\n[dim]Sample URLs:[/dim]")
-        for url in urls[:10]:
-            self.console.print(f"  • {url.url}")
+        self.console.print(
+            "\n".join(f"  • {u.url}" for u in urls[:10]), markup=False, highlight=False
+        )
         if len(urls) > 10:
             self.console.print(f"  [dim]... and {len(urls) - 10} more[/dim]")
 
         include_pattern = None
         exclude_pattern = None
+        keep: Callable[[DiscoveredURL], bool] | None = None
+        total = len(urls)
 
         # Ask about filtering
         if Confirm.ask("\nWould you like to filter URLs by pattern?", default=len(urls) > 100):
@@ -332,56 +511,76 @@ class InteractiveExtractor:
                 exclude_pattern = exclude_input.strip()
 
             # Apply filters and show result
-            import re
-            filtered = urls
+            inc_search = exc_search = None
             if include_pattern:
                 try:
-                    include_re = re.compile(include_pattern)
-                    before_include = len(filtered)
-                    filtered = [u for u in filtered if include_re.search(u.url)]
-                    self.console.print(
-                        f"  [dim]Include pattern matched"
-                        f" {len(filtered)}/{before_include} URLs[/dim]"
-                    )
+                    inc_search = _url_matcher(include_pattern)
                 except re.error as e:
                     self.console.print(f"[red]Invalid include pattern: {e}[/red]")
                     include_pattern = None
 
             if exclude_pattern:
                 try:
-                    exclude_re = re.compile(exclude_pattern)
-                    before_exclude = len(filtered)
-                    filtered = [u for u in filtered if not exclude_re.search(u.url)]
-                    removed = before_exclude - len(filtered)
-                    self.console.print(
-                        f"  [dim]Exclude pattern removed {removed} URLs[/dim]"
-                    )
+                    exc_search = _url_matcher(exclude_pattern)
                 except re.error as e:
                     self.console.print(f"[red]Invalid exclude pattern: {e}[/red]")
                     exclude_pattern = None
 
-            self.console.print(f"\n[green]After filtering: {len(filtered)} pages[/green]")
+            # Count matches without materializing the filtered list; only
+            # the preview and the pages actually kept are built below
+            if inc_search or exc_search:
+
+                def matches(u: DiscoveredURL) -> bool:
+                    if inc_search and not inc_search(u.url):
+                        return False
+                    return not (exc_search and exc_search(u.url))
+
+                keep = matches
+                # Same checks as matches(), split to count each filter's effect
+                included = total = 0
+                for u in urls:
+                    if inc_search and not inc_search(u.url):
+                        continue
+                    included += 1
+                    if exc_search and exc_search(u.url):
+                        continue
+                    total += 1
+
+                if inc_search:
+                    self.console.print(
+                        f"  [dim]Include pattern matched"
+                        f" {included}/{len(urls)} URLs[/dim]"
+                    )
+                if exc_search:
+                    self.console.print(
+                        f"  [dim]Exclude pattern removed {included - total} URLs[/dim]"
+                    )
+
+            self.console.print(f"\n[green]After filtering: {total} pages[/green]")
 
-            if filtered and len(filtered) != len(urls):
+            if keep and total and total != len(urls):
                 self.console.print("[dim]Filtered URLs:[/dim]")
-                for url in filtered[:10]:
-                    self.console.print(f"  • {url.url}")
-                if len(filtered) > 10:
-                    self.console.print(f"  [dim]... and {len(filtered) - 10} more[/dim]")
-
-            urls = filtered
+                self.console.print(
+                    "\n".join(f"  • {u.url}" for u in islice(filter(keep, urls), 10)),
+                    markup=False,
+                    highlight=False,
+                )
+                if total > 10:
+                    self.console.print(f"  [dim]... and {total - 10} more[/dim]")
 
         # Always ask about page limit
-        self.console.print(f"\n[bold]Pages to extract:[/bold] {len(urls)}")
+        self.console.print(f"\n[bold]Pages to extract:[/bold] {total}")
         max_pages = IntPrompt.ask(
             "How many pages to extract? (0 = all)",
-            default=min(len(urls), 100)
+            default=min(total, 100)
         )
 
-        if max_pages > 0 and max_pages < len(urls):
-            urls = urls[:max_pages]
+        selected = filter(keep, urls) if keep else iter(urls)
+        if max_pages > 0 and max_pages < total:
+            urls = list(islice(selected, max_pages))
             self.console.print(f"[green]Will extract {len(urls)} pages[/green]")
         else:
+            urls = list(selected)
             self.console.print(f"[green]Will extract all {len(urls)} pages[/green]")
 
         return urls, include_pattern, exclude_pattern
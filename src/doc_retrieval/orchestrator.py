@@ -1,15 +1,21 @@
 """Main orchestrator that coordinates the extraction pipeline."""
 
 import asyncio
+import bisect
+import hashlib
+import heapq
 import logging
+import os
 import re
 import time
-from collections import Counter
+from collections import Counter, defaultdict, deque
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from urllib.parse import urlparse
+from urllib.parse import SplitResult, urlparse, urlsplit
 
 from rich.console import Console, Group
 from rich.live import Live
@@ -45,6 +51,7 @@ from doc_retrieval.output.multi_file import MultiFileOutput
 from doc_retrieval.output.single_file import SingleFileOutput
 from doc_retrieval.patterns import PatternRegistry, SitePattern
 from doc_retrieval.utils.rate_limiter import RateLimiter
+from doc_retrieval.utils.regex_cache import compiled
 from doc_retrieval.utils.url_utils import normalize_url
 
 logger = logging.getLogger(__name__)
@@ -62,6 +69,9 @@ class PageStatus(str, Enum):
     ERROR = "error"
 
 
+_FINISHED_STATUSES = frozenset({PageStatus.DONE, PageStatus.SKIPPED, PageStatus.ERROR})
+
+
 class ErrorCategory(str, Enum):
     """Category of an error for summary reporting."""
 
@@ -84,12 +94,52 @@ _ERROR_SUGGESTIONS: dict[ErrorCategory, str] = {
     ErrorCategory.UNKNOWN: "Rerun with --verbose for details",
 }
 
+# Error-message keywords for _categorize_error, matched in one C-level scan
+_TIMEOUT_RE = re.compile(r"timeout|timed out", re.IGNORECASE)
+_CONNECTION_RE = re.compile(r"connect|refused|dns|network|socket", re.IGNORECASE)
+
+# Extraction results kept per response body; docs sites often serve the
+# same HTML under several URLs (aliases, index pages, soft 404s)
+_EXTRACT_CACHE_SIZE = 512
+
+# Upper bounds of the tiny/small/normal page-size buckets in the summary
+_SIZE_BUCKET_BOUNDS = (1024, 5120, 20480)
+_SLOWEST_PAGES = 5
+
+# List items that are primarily links, for _is_category_page:
+# - **[text](url)** or - [text](url) or * [text](url)
+_LINK_LIST_ITEM_RE = re.compile(r"^[-*]\s+(\*\*)?(\[.+?\]\(.+?\))(\*\*)?\s*$")
+
+# Phrases marking a login/auth wall, checked on short extracted text only
+_LOGIN_KEYWORDS = (
+    "please login",
+    "please log in",
+    "please sign in",
+    "sign in to",
+    "authentication required",
+    "log in to continue",
+    "sign in to continue",
+    "you must be logged in",
+    "you need to sign in",
+    "login required",
+)
+
+_STATUS_STYLES = {
+    PageStatus.FETCHING: "cyan",
+    PageStatus.EXTRACTING: "yellow",
+    PageStatus.CONVERTING: "magenta",
+    PageStatus.DONE: "green",
+    PageStatus.SKIPPED: "dim",
+    PageStatus.ERROR: "red",
+}
+
 
-@dataclass
+@dataclass(slots=True)
 class PageTiming:
     """Timing data for a single page through the pipeline."""
 
     url: str
+    order: int = 0  # Position in discovery order, used to break output ties
     status: PageStatus = PageStatus.QUEUED
     fetch_start: float = 0.0
     fetch_end: float = 0.0
@@ -132,8 +182,8 @@ class ExtractionResult:
     """Result of the extraction process."""
 
     def __init__(self):
-        self.pages: list[FormattedPage] = []
         self.errors: list[tuple[str, str, ErrorCategory]] = []  # (url, msg, category)
+        self.error_categories: Counter[ErrorCategory] = Counter()  # see record_error()
         self.skipped: list[str] = []
         self.skipped_categories: list[str] = []
         self.page_timings: list[PageTiming] = []
@@ -141,10 +191,42 @@ class ExtractionResult:
         self.pipeline_end: float = 0.0
         self.discovery_duration: float = 0.0
         self.output_duration: float = 0.0
-
-    @property
-    def success_count(self) -> int:
-        return len(self.pages)
+        # Summary aggregates over written pages, maintained by record_page()
+        self.success_count = 0
+        self.output_size = 0
+        self.size_buckets = [0] * (len(_SIZE_BUCKET_BOUNDS) + 1)
+        self.stage_totals: dict[str, float] = defaultdict(float)
+        self.stage_counts: Counter[str] = Counter()
+        self.method_counts: Counter[str] = Counter()
+        # Min-heap of (total_duration, -sequence, timing), slowest pages kept
+        self.slowest: list[tuple[float, int, PageTiming]] = []
+
+    def record_error(self, url: str, message: str, category: ErrorCategory) -> None:
+        """Record a failed page and count it under its category."""
+        self.errors.append((url, message, category))
+        self.error_categories[category] += 1
+
+    def record_page(self, timing: PageTiming, size: int) -> None:
+        """Fold a written page into the summary aggregates."""
+        self.success_count += 1
+        self.output_size += size
+        self.size_buckets[bisect.bisect_right(_SIZE_BUCKET_BOUNDS, size)] += 1
+        for stage, duration in (
+            ("fetch", timing.fetch_duration),
+            ("extract", timing.extract_duration),
+            ("convert", timing.convert_duration),
+        ):
+            if duration:
+                self.stage_totals[stage] += duration
+                self.stage_counts[stage] += 1
+        if timing.extraction_method:
+            self.method_counts[timing.extraction_method] += 1
+        # Earlier pages win ties, as with a stable sort
+        entry = (timing.total_duration, -self.success_count, timing)
+        if len(self.slowest) < _SLOWEST_PAGES:
+            heapq.heappush(self.slowest, entry)
+        else:
+            heapq.heappushpop(self.slowest, entry)
 
     @property
     def error_count(self) -> int:
@@ -160,7 +242,17 @@ class Orchestrator:
         self.rate_limiter = RateLimiter(
             config.rate_limit.delay_seconds,
             config.rate_limit.max_concurrent,
+            config.rate_limit.requests_per_minute,
         )
+        self._extract_cache: dict[tuple[bytes, str | None], ExtractedContent | None] = {}
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        # Live display state, maintained on status transitions so a redraw
+        # costs O(active pages) rather than a sweep over every page. Row
+        # cells are built once per transition; redraws only format timers.
+        self._active: dict[int, tuple[PageTiming, Text, str]] = {}
+        self._recent_done: deque[tuple[Text, str, str]] = deque(maxlen=3)
+        self._finished_count = 0
+        self._display_dirty = asyncio.Event()
 
     async def run(self) -> ExtractionResult:
         """Execute the full extraction pipeline."""
@@ -180,171 +272,197 @@ class Orchestrator:
             include_metadata=self.config.output.include_metadata,
             include_toc=self.config.output.include_toc,
         )
+        writer = self._create_writer()
 
-        # Discover URLs first (to get count for progress bar)
+        # Stream discovery into a bounded queue so fetching starts as soon as
+        # the first URL is known and only a window of URLs is held at once
         self.console.print(f"[blue]Discovering pages from {self.config.base_url}...[/blue]")
 
+        skip_set = self._load_skip_set()
+        num_workers = self.config.rate_limit.max_concurrent
+        queue: asyncio.Queue[PageTiming | None] = asyncio.Queue(maxsize=2 * num_workers)
         discovery_start = time.monotonic()
-        urls = []
-        async for discovered in discoverer.discover():
-            urls.append(discovered)
-            if self.config.verbose:
-                self.console.print(f"  Found: {discovered.url}")
-
-        if not urls:
-            self.console.print("[yellow]No pages found to extract.[/yellow]")
-            result.pipeline_end = time.monotonic()
-            return result
-
-        # Deduplicate URLs by normalized form (handles trailing-slash variants)
-        original_count = len(urls)
-        seen: set[str] = set()
-        unique_urls: list = []
-        for discovered in urls:
-            norm = normalize_url(discovered.url)
-            if norm not in seen:
-                seen.add(norm)
-                unique_urls.append(discovered)
-        urls = unique_urls
-        if self.config.verbose and len(urls) < original_count:
-            self.console.print(
-                f"[dim]Deduplicated: {original_count} → {len(urls)} unique URLs[/dim]"
-            )
 
-        if self.config.skip_urls and self.config.skip_urls.exists():
-            with open(self.config.skip_urls) as f:
-                skip_set = {
-                    normalize_url(line.strip())
-                    for line in f
-                    if line.strip() and not line.startswith("#")
-                }
-            before_skip = len(urls)
-            urls = [u for u in urls if normalize_url(u.url) not in skip_set]
-            skipped_count = before_skip - len(urls)
+        async def produce() -> None:
+            seen: set[str] = set()
+            found = duplicates = skipped_count = 0
+            try:
+                async for discovered in discoverer.discover():
+                    found += 1
+                    if self.config.verbose:
+                        self.console.print(f"  Found: {discovered.url}")
+                    # Deduplicate by normalized form (handles trailing-slash variants)
+                    norm = normalize_url(discovered.url)
+                    if norm in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(norm)
+                    if norm in skip_set:
+                        skipped_count += 1
+                        continue
+                    timing = PageTiming(url=discovered.url, order=len(result.page_timings))
+                    result.page_timings.append(timing)
+                    await queue.put(timing)
+            except BaseException:
+                # Cancelled or failed: nothing may be draining the queue any
+                # more, so only wake the idle workers that fit without blocking
+                for _ in range(num_workers):
+                    try:
+                        queue.put_nowait(None)
+                    except asyncio.QueueFull:
+                        break
+                raise
+            finally:
+                result.discovery_duration = time.monotonic() - discovery_start
+            for _ in range(num_workers):
+                await queue.put(None)
+
+            if self.config.verbose and duplicates:
+                self.console.print(
+                    f"[dim]Deduplicated: {found} → {found - duplicates} unique URLs[/dim]"
+                )
             if skipped_count:
                 self.console.print(
                     f"[dim]Skipped {skipped_count} URLs from skip file[/dim]"
                 )
-
-        result.discovery_duration = time.monotonic() - discovery_start
-        disc_rate = len(urls) / result.discovery_duration if result.discovery_duration > 0 else 0
-        self.console.print(
-            f"[green]Found {len(urls)} pages to extract[/green]"
-            f" [dim]({disc_rate:.1f} pages/sec)[/dim]"
-        )
-
-        for discovered in urls:
-            result.page_timings.append(PageTiming(url=discovered.url))
-
-        async with fetcher:
-            # Auto-detect pattern from the first page if none specified
-            probe_result: FetchResult | None = None
-            if not pattern:
-                first_url = urls[0].url
-                try:
-                    probe_result = await fetcher.fetch(first_url)
-                    if probe_result.html:
-                        detected = PatternRegistry.detect(
-                            first_url, probe_result.html
-                        )
-                        if detected:
-                            pattern = detected
-                            self._apply_pattern(pattern)
-                            if self.config.verbose:
-                                self.console.print(
-                                    f"[blue]Auto-detected pattern:"
-                                    f" {pattern.name}[/blue]"
-                                )
-                except Exception:
-                    logger.debug("Pattern auto-detection probe failed", exc_info=True)
-                    probe_result = None
-
-            progress = Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                TaskProgressColumn(),
-                TimeElapsedColumn(),
-                TextColumn("•"),
-                TimeRemainingColumn(),
-                console=self.console,
-            )
-            progress_task = progress.add_task("Extracting...", total=len(urls))
-
-            live = Live(
-                self._build_live_display(progress, result),
-                console=self.console,
-                refresh_per_second=4,
+            total = len(result.page_timings)
+            if not total:
+                return
+            disc_rate = total / result.discovery_duration if result.discovery_duration > 0 else 0
+            self.console.print(
+                f"[green]Found {total} pages to extract[/green]"
+                f" [dim]({disc_rate:.1f} pages/sec)[/dim]"
             )
 
-            with live:
-                refresh_stop = asyncio.Event()
-
-                async def refresh_display():
-                    while not refresh_stop.is_set():
-                        live.update(self._build_live_display(progress, result))
-                        try:
-                            await asyncio.wait_for(refresh_stop.wait(), timeout=0.25)
-                        except asyncio.TimeoutError:
-                            pass
-
-                refresh_task = asyncio.create_task(refresh_display())
-
-                tasks = [
-                    self._process_page(
-                        discovered, fetcher, extractor, formatter,
-                        result, progress, progress_task, probe_result,
-                        result.page_timings[i],
-                    )
-                    for i, discovered in enumerate(urls)
-                ]
-                await asyncio.gather(*tasks)
+        producer = asyncio.create_task(produce())
+        try:
+            # Enter the fetcher (a browser launch for JS sites) while
+            # discovery is still looking for the first URL
+            async with fetcher:
+                first = await queue.get()
+                if first is None:
+                    await producer
+                    self.console.print("[yellow]No pages found to extract.[/yellow]")
+                    result.pipeline_end = time.monotonic()
+                    return result
+
+                # Auto-detect pattern from the first page if none specified
+                probe_cache: dict[str, FetchResult] = {}
+                if not pattern:
+                    pattern = await self._probe_pattern(fetcher, first.url, probe_cache)
+
+                progress = Progress(
+                    SpinnerColumn(),
+                    TextColumn("[progress.description]{task.description}"),
+                    BarColumn(),
+                    TaskProgressColumn(),
+                    TimeElapsedColumn(),
+                    TextColumn("•"),
+                    TimeRemainingColumn(),
+                    console=self.console,
+                )
+                progress_task = progress.add_task(
+                    "Extracting...", total=len(result.page_timings)
+                )
 
-                refresh_stop.set()
-                await refresh_task
-                # Final update
-                live.update(self._build_live_display(progress, result))
+                live = Live(
+                    self._build_live_display(progress, result),
+                    console=self.console,
+                    auto_refresh=False,
+                )
 
-            # Sort pages by URL for deterministic output
-            result.pages.sort(key=lambda p: p.url)
+                with live:
+                    refresh_stop = asyncio.Event()
+
+                    async def refresh_display():
+                        # Redraw when a page changes status, at most 4 times a
+                        # second, with a 1s heartbeat for the elapsed timers
+                        while not refresh_stop.is_set():
+                            self._display_dirty.clear()
+                            self._sync_progress(progress, progress_task, result)
+                            live.update(
+                                self._build_live_display(progress, result), refresh=True
+                            )
+                            try:
+                                await asyncio.wait_for(self._display_dirty.wait(), timeout=1.0)
+                                await asyncio.wait_for(refresh_stop.wait(), timeout=0.25)
+                            except asyncio.TimeoutError:
+                                pass
+
+                    refresh_task = asyncio.create_task(refresh_display())
+
+                    async def worker() -> None:
+                        while (timing := await queue.get()) is not None:
+                            await self._process_page(
+                                timing.url, fetcher, extractor, formatter, writer,
+                                result, probe_cache, timing,
+                            )
 
-        # Write output
-        if result.pages:
+                    try:
+                        await _run_all(
+                            producer,
+                            self._process_page(
+                                first.url, fetcher, extractor, formatter, writer,
+                                result, probe_cache, first,
+                            ),
+                            *(worker() for _ in range(num_workers)),
+                        )
+                    finally:
+                        refresh_stop.set()
+                        self._display_dirty.set()
+                        await refresh_task
+
+                    # Final update
+                    self._sync_progress(progress, progress_task, result)
+                    live.update(self._build_live_display(progress, result), refresh=True)
+        except BaseException:
+            producer.cancel()
+            # Wait for discovery to unwind so nothing outlives the run
+            await asyncio.wait([producer])
+            await writer.abort()
+            raise
+
+        # Finish output; pages were written as they completed
+        if result.success_count:
             site_info = SiteInfo(
                 base_url=self.config.base_url,
-                total_pages=len(result.pages),
+                total_pages=result.success_count,
                 extracted_at=datetime.now(),
             )
 
             output_start = time.monotonic()
-            output_path = await self._write_output(result.pages, site_info)
+            output_path = await writer.close(site_info)
             result.output_duration = time.monotonic() - output_start
 
             if self.config.output.mode == OutputMode.SINGLE:
-                size = output_path.stat().st_size
+                size = (await asyncio.to_thread(output_path.stat)).st_size
                 self.console.print(
                     f"[green]Written to {output_path}"
-                    f" ({_format_size(size)}, {len(result.pages)} pages)[/green]"
+                    f" ({_format_size(size)}, {result.success_count} pages)[/green]"
                 )
             else:
-                md_files = list(output_path.glob("*.md"))
-                total_size = sum(f.stat().st_size for f in md_files)
+                file_count, total_size = await asyncio.to_thread(
+                    _scan_markdown_files, output_path
+                )
                 self.console.print(
                     f"[green]Written to {output_path}/"
-                    f" ({len(md_files)} files, {_format_size(total_size)} total)[/green]"
+                    f" ({file_count} files, {_format_size(total_size)} total)[/green]"
                 )
 
         result.pipeline_end = time.monotonic()
+        logger.debug("Regex cache: %s", compiled.cache_info())
 
         self._print_summary(result)
 
         if result.errors:
             failed_path = self.config.output.path.parent / ".failed-urls.txt"
-            with open(failed_path, "w") as f:
-                f.write("# Failed URLs from doc-retrieval run\n")
-                f.write(f"# {datetime.now().isoformat()}\n")
-                for err_url, _msg, _cat in result.errors:
-                    f.write(f"{err_url}\n")
+            lines = [
+                "# Failed URLs from doc-retrieval run",
+                f"# {datetime.now().isoformat()}",
+                *(err_url for err_url, _msg, _cat in result.errors),
+                "",
+            ]
+            await asyncio.to_thread(failed_path.write_text, "\n".join(lines))
             self.console.print(f"[yellow]Failed URLs: {failed_path}[/yellow]")
             self.console.print(
                 f"[dim]Rerun with --skip-urls {failed_path} to skip these[/dim]"
@@ -352,6 +470,32 @@ class Orchestrator:
 
         return result
 
+    def _sync_progress(self, progress: Progress, task_id, result: ExtractionResult) -> None:
+        """Update the progress bar from page statuses once per display refresh.
+
+        Pages never touch the bar themselves, so Rich does one update per
+        refresh rather than one per page. The total grows while discovery
+        is still running.
+        """
+        progress.update(
+            task_id, total=len(result.page_timings), completed=self._finished_count
+        )
+
+    def _set_status(self, timing: PageTiming, status: PageStatus) -> None:
+        """Move a page to a new status and flag the live display for a redraw."""
+        timing.status = status
+        label = Text(status.value, style=_STATUS_STYLES.get(status, "white"))
+        url_display = _truncate_url(timing.url, 60)
+        if status in _FINISHED_STATUSES:
+            self._active.pop(id(timing), None)
+            self._recent_done.append(
+                (label, url_display, f"{timing.total_duration:.1f}s")
+            )
+            self._finished_count += 1
+        else:
+            self._active[id(timing)] = (timing, label, url_display)
+        self._display_dirty.set()
+
     def _build_live_display(self, progress: Progress, result: ExtractionResult) -> Group:
         """Build the live display with progress bar and status table."""
         now = time.monotonic()
@@ -361,58 +505,30 @@ class Orchestrator:
         table.add_column("URL", min_width=40, overflow="ellipsis", no_wrap=True)
         table.add_column("Elapsed", width=8, justify="right")
 
-        active_statuses = {PageStatus.FETCHING, PageStatus.EXTRACTING, PageStatus.CONVERTING}
-        active = [
-            t for t in result.page_timings if t.status in active_statuses
-        ]
-        done = [
-            t for t in result.page_timings
-            if t.status in {PageStatus.DONE, PageStatus.SKIPPED, PageStatus.ERROR}
-        ]
-
-        status_styles = {
-            PageStatus.FETCHING: "cyan",
-            PageStatus.EXTRACTING: "yellow",
-            PageStatus.CONVERTING: "magenta",
-            PageStatus.DONE: "green",
-            PageStatus.SKIPPED: "dim",
-            PageStatus.ERROR: "red",
-        }
-
-        for timing in active:
-            start = timing.fetch_start or now
-            elapsed = now - start
-            style = status_styles.get(timing.status, "white")
-            url_display = _truncate_url(timing.url, 60)
-            table.add_row(
-                Text(timing.status.value, style=style),
-                url_display,
-                f"{elapsed:.1f}s",
-            )
+        for timing, label, url_display in self._active.values():
+            elapsed = now - (timing.fetch_start or now)
+            table.add_row(label, url_display, f"{elapsed:.1f}s")
 
         # Show last 3 completed pages
-        for timing in done[-3:]:
-            style = status_styles.get(timing.status, "white")
-            url_display = _truncate_url(timing.url, 60)
-            table.add_row(
-                Text(timing.status.value, style=style),
-                url_display,
-                f"{timing.total_duration:.1f}s",
-            )
+        for row in self._recent_done:
+            table.add_row(*row)
 
         elements: list[Progress | Text | Table] = [progress]
-        done_count = len(done)
+        done_count = self._finished_count
         if done_count > 0 and result.pipeline_start:
             elapsed = now - result.pipeline_start
             if elapsed > 0:
                 rate = done_count / elapsed
                 elements.append(Text(f"  {rate:.1f} pages/sec", style="dim"))
         if self.rate_limiter.is_throttled:
+            limiter = self.rate_limiter
+            causes = f"{limiter.backoff_count} backoff(s)"
+            if limiter.quota_slowdowns:
+                causes += f", {limiter.quota_slowdowns} quota slowdown(s)"
             elements.append(
                 Text(
-                    f"  Throttled: delay {self.rate_limiter.delay_seconds:.1f}s"
-                    f" (configured {self.rate_limiter._original_delay:.1f}s)"
-                    f" — {self.rate_limiter.backoff_count} backoff(s)",
+                    f"  Throttled: delay {limiter.delay_seconds:.1f}s"
+                    f" (configured {limiter._original_delay:.1f}s) — {causes}",
                     style="bold yellow",
                 )
             )
@@ -421,30 +537,27 @@ class Orchestrator:
 
     def _print_summary(self, result: ExtractionResult) -> None:
         """Print a detailed post-run summary report."""
-        self.console.print()
         total_time = result.pipeline_end - result.pipeline_start
 
-        # Header
-        self.console.print("[bold]Extraction complete[/bold]")
-        self.console.print()
-
-        # Counts
-        self.console.print(f"  Pages extracted: [green]{result.success_count}[/green]")
+        # Header and counts, rendered in one console call
+        lines = [
+            "",
+            "[bold]Extraction complete[/bold]",
+            "",
+            f"  Pages extracted: [green]{result.success_count}[/green]",
+        ]
         if result.error_count:
-            self.console.print(f"  Errors:          [red]{result.error_count}[/red]")
+            lines.append(f"  Errors:          [red]{result.error_count}[/red]")
         if result.skipped:
-            self.console.print(f"  Skipped:         [yellow]{len(result.skipped)}[/yellow]")
+            lines.append(f"  Skipped:         [yellow]{len(result.skipped)}[/yellow]")
         if result.skipped_categories:
-            self.console.print(
+            lines.append(
                 f"  Category pages:  [yellow]{len(result.skipped_categories)}[/yellow]"
             )
-        self.console.print()
+        lines.append("")
+        self.console.print("\n".join(lines))
 
         # Timing breakdown
-        done_timings = [
-            t for t in result.page_timings if t.status == PageStatus.DONE
-        ]
-
         self.console.print("[bold]Timing[/bold]")
         self.console.print(f"  Total:     {total_time:.1f}s")
         if result.discovery_duration:
@@ -452,23 +565,14 @@ class Orchestrator:
         if result.output_duration:
             self.console.print(f"  Output:    {result.output_duration:.1f}s")
 
-        if done_timings:
-            fetch_times = [t.fetch_duration for t in done_timings if t.fetch_duration]
-            extract_times = [t.extract_duration for t in done_timings if t.extract_duration]
-            convert_times = [t.convert_duration for t in done_timings if t.convert_duration]
-
-            if fetch_times:
-                avg = sum(fetch_times) / len(fetch_times)
-                total = sum(fetch_times)
-                self.console.print(f"  Fetch:     avg {avg:.2f}s, total {total:.1f}s")
-            if extract_times:
-                avg = sum(extract_times) / len(extract_times)
-                total = sum(extract_times)
-                self.console.print(f"  Extract:   avg {avg:.2f}s, total {total:.1f}s")
-            if convert_times:
-                avg = sum(convert_times) / len(convert_times)
-                total = sum(convert_times)
-                self.console.print(f"  Convert:   avg {avg:.2f}s, total {total:.1f}s")
+        for stage in ("fetch", "extract", "convert"):
+            count = result.stage_counts[stage]
+            if count:
+                total = result.stage_totals[stage]
+                label = f"{stage.capitalize()}:"
+                self.console.print(
+                    f"  {label:<10s} avg {total / count:.2f}s, total {total:.1f}s"
+                )
 
         # Throughput
         if total_time > 0 and result.success_count > 0:
@@ -477,11 +581,10 @@ class Orchestrator:
             self.console.print(f"  [bold]Throughput: {throughput:.1f} pages/sec[/bold]")
 
         # Top 5 slowest pages
-        if done_timings:
-            slowest = sorted(done_timings, key=lambda t: t.total_duration, reverse=True)[:5]
+        if result.slowest:
             self.console.print()
             self.console.print("[bold]Slowest pages[/bold]")
-            for timing in slowest:
+            for _duration, _seq, timing in sorted(result.slowest, reverse=True):
                 url_short = _truncate_url(timing.url, 50)
                 parts = []
                 if timing.fetch_duration:
@@ -497,26 +600,17 @@ class Orchestrator:
                 )
 
         # Extraction methods
-        if done_timings:
-            method_counts: Counter[str] = Counter()
-            for t in done_timings:
-                if t.extraction_method:
-                    method_counts[t.extraction_method] += 1
-            if method_counts:
-                self.console.print()
-                self.console.print("[bold]Extraction methods[/bold]")
-                for method, count in method_counts.most_common():
-                    self.console.print(f"  {method:<15s} {count}")
+        if result.method_counts:
+            self.console.print()
+            self.console.print("[bold]Extraction methods[/bold]")
+            for method, count in result.method_counts.most_common():
+                self.console.print(f"  {method:<15s} {count}")
 
         # Content quality
-        if result.pages:
-            page_sizes = [len(p.markdown) for p in result.pages]
-            total_output = sum(page_sizes)
-            avg_size = total_output // len(page_sizes)
-            tiny = sum(1 for s in page_sizes if s < 1024)
-            small = sum(1 for s in page_sizes if 1024 <= s < 5120)
-            normal = sum(1 for s in page_sizes if 5120 <= s < 20480)
-            large = sum(1 for s in page_sizes if s >= 20480)
+        if result.success_count:
+            total_output = result.output_size
+            avg_size = total_output // result.success_count
+            tiny, small, normal, large = result.size_buckets
 
             self.console.print()
             self.console.print("[bold]Content quality[/bold]")
@@ -526,17 +620,20 @@ class Orchestrator:
                 f"  Size distribution: {tiny} tiny (<1KB), {small} small,"
                 f" {normal} normal, {large} large (>20KB)"
             )
-            if len(page_sizes) > 0 and tiny / len(page_sizes) > 0.3:
+            if tiny / result.success_count > 0.3:
                 self.console.print(
                     "  [yellow]Warning: >30% of pages are tiny — check extraction quality[/yellow]"
                 )
 
         # Rate limiting
-        if self.rate_limiter.backoff_count > 0:
+        if self.rate_limiter.backoff_count or self.rate_limiter.quota_slowdowns:
             self.console.print()
             self.console.print("[bold]Rate limiting[/bold]")
             self.console.print(
-                f"  429 backoffs:    {self.rate_limiter.backoff_count}"
+                f"  Backoffs:        {self.rate_limiter.backoff_count} (429/503)"
+            )
+            self.console.print(
+                f"  Quota slowdowns: {self.rate_limiter.quota_slowdowns} (rate-limit headers)"
             )
             self.console.print(
                 f"  Peak delay:      {self.rate_limiter.peak_delay:.1f}s"
@@ -545,6 +642,10 @@ class Orchestrator:
                 f"  Final delay:     {self.rate_limiter.delay_seconds:.1f}s"
                 f" (configured {self.rate_limiter._original_delay:.1f}s)"
             )
+            self.console.print(
+                f"  Concurrency:     {int(self.rate_limiter.concurrency)}"
+                f" (configured {self.rate_limiter.max_concurrent})"
+            )
 
         # Retries
         retried = [t for t in result.page_timings if t.retry_attempts > 1]
@@ -564,9 +665,7 @@ class Orchestrator:
         if result.errors:
             self.console.print()
             # Category breakdown
-            category_counts: Counter[ErrorCategory] = Counter()
-            for _url, _msg, cat in result.errors:
-                category_counts[cat] += 1
+            category_counts = result.error_categories
             self.console.print("[bold red]Errors[/bold red]")
             for cat, count in category_counts.most_common():
                 self.console.print(f"  {cat.value:<15s} {count}")
@@ -585,35 +684,34 @@ class Orchestrator:
 
     async def _process_page(
         self,
-        discovered,
+        url: str,
         fetcher: BaseFetcher,
         extractor: ContentExtractor,
         formatter: LLMFormatter,
+        writer: SingleFileOutput | MultiFileOutput,
         result: ExtractionResult,
-        progress: Progress,
-        task_id,
-        cached_probe: FetchResult | None,
+        probe_cache: dict[str, FetchResult],
         timing: PageTiming,
     ) -> None:
         """Fetch, extract, and format a single page with rate limiting."""
-        url = discovered.url
-
         # Pre-filter obvious category pages by URL before expensive fetch
         if self._is_likely_category_url(url):
             result.skipped_categories.append(url)
-            timing.status = PageStatus.SKIPPED
-            progress.update(task_id, advance=1)
+            self._set_status(timing, PageStatus.SKIPPED)
             return
 
         try:
-            await self.rate_limiter.acquire()
-            try:
-                timing.status = PageStatus.FETCHING
+            # Per-host slot first, so a busy host never holds a global slot
+            # while it waits
+            async with self._host_slot(url), self.rate_limiter:
+                self._set_status(timing, PageStatus.FETCHING)
                 timing.fetch_start = time.monotonic()
 
-                # Reuse the probe result if this is the same URL
-                if cached_probe and url == cached_probe.url:
-                    fetch_result = cached_probe
+                # Reuse the probe result if this is the same page; the
+                # cache entry is dropped so it doesn't pin the page
+                cached = probe_cache.pop(normalize_url(url), None) if probe_cache else None
+                if cached is not None:
+                    fetch_result = cached
                 else:
                     fetch_result = await fetcher.fetch_with_retry(
                         url,
@@ -623,10 +721,18 @@ class Orchestrator:
 
                 timing.fetch_end = time.monotonic()
                 timing.retry_attempts = fetch_result.attempts
+                if cached is None and fetch_result.attempts == 1:
+                    # Retry sleeps would skew the congestion signal
+                    self.rate_limiter.record_latency(timing.fetch_end - timing.fetch_start)
+                self.rate_limiter.observe_limits(
+                    fetch_result.rate_limit_remaining,
+                    fetch_result.rate_limit_reset,
+                    fetch_result.retry_after,
+                )
 
                 if not fetch_result.success:
+                    self.rate_limiter.record_error(fetch_result.status_code)
                     if fetch_result.status_code == 429:
-                        self.rate_limiter.back_off()
                         if self.config.verbose:
                             self.console.print(
                                 f"[yellow]429 backoff: {url}"
@@ -636,33 +742,33 @@ class Orchestrator:
                     category = self._categorize_error(
                         fetch_result.status_code, error_msg, "fetch"
                     )
-                    result.errors.append((url, error_msg, category))
-                    timing.status = PageStatus.ERROR
+                    result.record_error(url, error_msg, category)
+                    self._set_status(timing, PageStatus.ERROR)
                     timing.error = error_msg
                     return
 
                 # Use final URL (accounts for client-side redirects)
                 effective_url = fetch_result.final_url or url
 
-                timing.status = PageStatus.EXTRACTING
+                self._set_status(timing, PageStatus.EXTRACTING)
                 timing.extract_start = time.monotonic()
 
-                content = extractor.extract(fetch_result.html, effective_url)
+                content = await self._extract(extractor, fetch_result, effective_url)
 
                 timing.extract_end = time.monotonic()
                 timing.extraction_method = (content.extraction_method or "") if content else ""
 
                 if not content or not content.html:
                     result.skipped.append(url)
-                    timing.status = PageStatus.SKIPPED
+                    self._set_status(timing, PageStatus.SKIPPED)
                     return
 
                 if self._is_login_gated(content):
                     result.skipped.append(url)
-                    timing.status = PageStatus.SKIPPED
+                    self._set_status(timing, PageStatus.SKIPPED)
                     return
 
-                timing.status = PageStatus.CONVERTING
+                self._set_status(timing, PageStatus.CONVERTING)
                 timing.convert_start = time.monotonic()
 
                 # Format — pass raw HTML so API schema detection
@@ -670,28 +776,89 @@ class Orchestrator:
                 page = formatter.format_page(
                     content, effective_url, raw_html=fetch_result.html
                 )
+                # Release the raw response before waiting on the writer
+                del fetch_result, cached, content
 
                 timing.convert_end = time.monotonic()
 
                 if self._is_category_page(page):
                     result.skipped_categories.append(url)
-                    timing.status = PageStatus.SKIPPED
+                    self._set_status(timing, PageStatus.SKIPPED)
                     return
 
-                result.pages.append(page)
-                timing.status = PageStatus.DONE
-                self.rate_limiter.ease_off()
-
-            finally:
-                self.rate_limiter.release()
+                await writer.append(page, timing.order)
+                result.record_page(timing, len(page.markdown))
+                self._set_status(timing, PageStatus.DONE)
+                self.rate_limiter.record_success()
         except Exception as e:
             error_msg = str(e)
             category = self._categorize_error(0, error_msg, "pipeline")
-            result.errors.append((url, error_msg, category))
-            timing.status = PageStatus.ERROR
+            result.record_error(url, error_msg, category)
+            self._set_status(timing, PageStatus.ERROR)
             timing.error = error_msg
-        finally:
-            progress.update(task_id, advance=1)
+
+    async def _probe_pattern(
+        self, fetcher: BaseFetcher, url: str, probe_cache: dict[str, FetchResult]
+    ) -> SitePattern | None:
+        """Fetch the first page to auto-detect the site pattern.
+
+        A successful response is cached under the normalized URL, where
+        _process_page picks it up instead of fetching the page again; a
+        failed probe is not, so that page is fetched with the usual retries.
+        """
+        try:
+            probe_result = await fetcher.fetch(url)
+            if probe_result.success:
+                probe_cache[normalize_url(url)] = probe_result
+            if not probe_result.html_bytes:
+                return None
+            pattern = PatternRegistry.detect(url, probe_result.html)
+        except Exception:
+            logger.debug("Pattern auto-detection probe failed", exc_info=True)
+            return None
+        if pattern:
+            self._apply_pattern(pattern)
+            if self.config.verbose:
+                self.console.print(f"[blue]Auto-detected pattern: {pattern.name}[/blue]")
+        return pattern
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore | nullcontext[None]:
+        """Return the concurrency slot for the URL's host, if hosts are capped."""
+        limit = self.config.rate_limit.max_concurrent_per_host
+        if not limit:
+            return nullcontext()
+        host = _split_url(url).netloc
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(limit)
+        return slot
+
+    async def _extract(
+        self, extractor: ContentExtractor, fetch_result: FetchResult, url: str
+    ) -> ExtractedContent | None:
+        """Extract main content, reusing the result for an identical body.
+
+        A content-selector match depends only on the body, so it is shared
+        by every URL serving that body. The trafilatura and later fallbacks
+        also read the URL (metadata, link handling), so they are only reused
+        for the same URL.
+        """
+        body = fetch_result.html_bytes
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        for key in ((digest, None), (digest, url)):
+            if key in self._extract_cache:
+                return self._extract_cache[key]
+        # Parsing is CPU-bound; run it off the loop so other pages'
+        # fetches keep progressing meanwhile
+        content = await asyncio.to_thread(
+            extractor.extract, body, url, fetch_result.encoding
+        )
+        if len(self._extract_cache) >= _EXTRACT_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            del self._extract_cache[next(iter(self._extract_cache))]
+        shared = content is not None and content.extraction_method == "css_selector"
+        self._extract_cache[digest, None if shared else url] = content
+        return content
 
     @staticmethod
     def _categorize_error(
@@ -704,18 +871,25 @@ class Orchestrator:
             return ErrorCategory.SERVER_ERROR
         if 400 <= status_code < 500:
             return ErrorCategory.CLIENT_ERROR
-        msg_lower = error_msg.lower()
-        if "timeout" in msg_lower or "timed out" in msg_lower:
+        if _TIMEOUT_RE.search(error_msg):
             return ErrorCategory.TIMEOUT
-        if any(
-            kw in msg_lower
-            for kw in ("connect", "refused", "dns", "network", "socket")
-        ):
+        if _CONNECTION_RE.search(error_msg):
             return ErrorCategory.CONNECTION
         if stage == "extract" or stage == "pipeline":
             return ErrorCategory.EXTRACTION
         return ErrorCategory.UNKNOWN
 
+    def _load_skip_set(self) -> set[str]:
+        """Read normalized URLs to skip from the --skip-urls file, if any."""
+        if not (self.config.skip_urls and self.config.skip_urls.exists()):
+            return set()
+        with open(self.config.skip_urls) as f:
+            return {
+                normalize_url(line.strip())
+                for line in f
+                if line.strip() and not line.startswith("#")
+            }
+
     def _get_pattern(self) -> SitePattern | None:
         """Get the site pattern if specified."""
         if self.config.pattern:
@@ -808,12 +982,8 @@ class Orchestrator:
             if not stripped or stripped.startswith("#") or stripped == "---":
                 continue
             content_count += 1
-            # Match list items that are primarily links:
-            # - **[text](url)** or - [text](url) or * [text](url)
-            if re.match(
-                r"^[-*]\s+(\*\*)?(\[.+?\]\(.+?\))(\*\*)?\s*$",
-                stripped,
-            ):
+            # Only list items can match; skip the regex for everything else
+            if stripped[0] in "-*" and _LINK_LIST_ITEM_RE.match(stripped):
                 link_list_count += 1
 
         if content_count == 0:
@@ -828,8 +998,7 @@ class Orchestrator:
         Docusaurus generates /category/ URLs for sidebar section pages.
         These are link lists with no substantive content.
         """
-        parsed = urlparse(url)
-        return "/category/" in parsed.path.lower()
+        return "/category/" in _split_url(url).path.lower()
 
     @staticmethod
     def _is_login_gated(content: ExtractedContent) -> bool:
@@ -838,39 +1007,48 @@ class Orchestrator:
         if len(text) >= 500:
             return False
 
-        login_keywords = [
-            "please login",
-            "please log in",
-            "please sign in",
-            "sign in to",
-            "authentication required",
-            "log in to continue",
-            "sign in to continue",
-            "you must be logged in",
-            "you need to sign in",
-            "login required",
-        ]
         text_lower = text.lower()
-        return any(kw in text_lower for kw in login_keywords)
+        return any(kw in text_lower for kw in _LOGIN_KEYWORDS)
 
-    async def _write_output(
-        self, pages: list[FormattedPage], site_info: SiteInfo
-    ) -> Path:
-        """Write the output files."""
-        writer: SingleFileOutput | MultiFileOutput
+    def _create_writer(self) -> SingleFileOutput | MultiFileOutput:
+        """Create the output writer pages are streamed into."""
         if self.config.output.mode == OutputMode.SINGLE:
-            writer = SingleFileOutput(
+            return SingleFileOutput(
                 self.config.output.path,
                 include_metadata=self.config.output.include_metadata,
                 include_toc=self.config.output.include_toc,
             )
-        else:
-            writer = MultiFileOutput(
-                self.config.output.path,
-                include_metadata=self.config.output.include_metadata,
-            )
+        return MultiFileOutput(
+            self.config.output.path,
+            include_metadata=self.config.output.include_metadata,
+        )
+
 
-        return await writer.write(pages, site_info)
+def _scan_markdown_files(directory: Path) -> tuple[int, int]:
+    """Return the count and total size of the Markdown files in a directory."""
+    file_count = 0
+    total_size = 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(".md") and entry.is_file():
+                file_count += 1
+                total_size += entry.stat().st_size
+    return file_count, total_size
+
+
+async def _run_all(*aws) -> None:
+    """Await tasks or coroutines together, cancelling the rest if one fails.
+
+    Gives ``asyncio.TaskGroup``'s cancel-on-error behaviour on Python 3.10.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
 
 
 def _format_size(size_bytes: int) -> str:
@@ -883,6 +1061,13 @@ def _format_size(size_bytes: int) -> str:
         return f"{size_bytes / (1024 * 1024):.1f} MB"
 
 
+@lru_cache(maxsize=4096)
+def _split_url(url: str) -> SplitResult:
+    """Split a URL once for the several per-page checks that need its parts."""
+    return urlsplit(url)
+
+
+@lru_cache(maxsize=1024)
 def _truncate_url(url: str, max_len: int) -> str:
     """Truncate a URL for display, keeping the path visible."""
     parsed = urlparse(url)
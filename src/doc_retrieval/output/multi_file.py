@@ -1,17 +1,53 @@
 """Multi-file output writer."""
 
+import asyncio
 import os
 import re
+from functools import lru_cache
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
-
-import aiofiles  # type: ignore[import-untyped]
+from typing import NamedTuple
+from urllib.parse import urljoin, urlparse, urlsplit
 
 from doc_retrieval.converter.llm_formatter import FormattedPage, LLMFormatter, SiteInfo
 
+# Page extensions dropped from URL paths, and characters unsafe in filenames
+_STRIPPED_EXTENSIONS = (".html", ".htm", ".php", ".asp", ".aspx")
+_UNSAFE_FILENAME_CHARS = str.maketrans(dict.fromkeys(':?*<>|"', "_"))
+
+_LINK_RE = re.compile(r"\[([^\]]*)\]\(([^)]+)\)")
+
+# Page files rewritten at once when internal links are fixed up on close
+_REWRITE_CONCURRENCY = 8
+
+# Page files written at once by write()
+_WRITE_CONCURRENCY = 32
+
+
+@lru_cache(maxsize=4096)
+def _relative_link(target: Path, base_dir: Path) -> str:
+    """Relative link from a page's directory to another page file.
+
+    Cached: pages in one directory share navigation links to the same targets.
+    """
+    return str(Path(os.path.relpath(target, base_dir)))
+
+
+class _WrittenPage(NamedTuple):
+    """What the link rewrite and index need to know about a written page."""
+
+    url: str
+    order: int
+    title: str | None
+    path: Path
+
 
 class MultiFileOutput:
-    """Write each page to a separate Markdown file."""
+    """Write each page to a separate Markdown file.
+
+    Pages can be streamed in with ``open``/``append``/``close``: each page is
+    written as soon as it arrives, and ``close`` rewrites internal links and
+    writes the index.
+    """
 
     def __init__(
         self,
@@ -20,31 +56,71 @@ class MultiFileOutput:
     ):
         self.output_dir = Path(output_dir)
         self.formatter = LLMFormatter(include_metadata=include_metadata, include_toc=False)
-
-    async def write(self, pages: list[FormattedPage], site_info: SiteInfo) -> Path:
-        """Write each page to a separate file and create an index."""
-        # Ensure output directory exists
+        self._written: list[_WrittenPage] = []
+        self._path_locks: dict[Path, asyncio.Lock] = {}
+        self._created_dirs: set[Path] = set()
+        # Resolved once; _get_filepath checks every page path against it
+        self._resolved_dir = self.output_dir.resolve()
+
+    async def open(self) -> None:
+        """Ensure the output directory exists."""
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._written = []
+        self._resolved_dir = self.output_dir.resolve()
+        self._created_dirs = {self._resolved_dir}
+
+    async def append(self, page: FormattedPage, order: int = 0) -> None:
+        """Write one page to its file.
+
+        ``order`` (the page's discovery position) breaks ties between pages
+        with the same URL in the index, as in SingleFileOutput.
+        """
+        filepath = self._get_filepath(page.url)
+
+        # Serialized per file, so two URLs mapping to one file never
+        # interleave writes while different files are written concurrently
+        lock = self._path_locks.setdefault(filepath, asyncio.Lock())
+        async with lock:
+            await asyncio.to_thread(self._write_page_file, filepath, page)
+            self._written.append(_WrittenPage(page.url, order, page.title, filepath))
+
+    async def close(self, site_info: SiteInfo) -> Path:
+        """Rewrite links between written pages and create the index."""
+        written_files = sorted(self._written, key=lambda w: (w.url, w.order))
+        await self._rewrite_internal_links(written_files)
+        await self._write_index(written_files, site_info)
 
-        written_files = []
+        return self.output_dir
 
-        for page in pages:
-            filepath = self._get_filepath(page.url, site_info.base_url)
-            filepath.parent.mkdir(parents=True, exist_ok=True)
+    async def abort(self) -> None:
+        """Stop without writing the index; page files already written are kept."""
+        self._written = []
 
-            content = self.formatter.format_single_page_output(page)
+    async def write(self, pages: list[FormattedPage], site_info: SiteInfo) -> Path:
+        """Write each page to a separate file and create an index."""
+        await self.open()
+        slots = asyncio.Semaphore(_WRITE_CONCURRENCY)
 
-            async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-                await f.write(content)
+        async def append(page: FormattedPage) -> None:
+            async with slots:
+                await self.append(page)
 
-            written_files.append((page, filepath))
+        await asyncio.gather(*(append(page) for page in pages))
+        return await self.close(site_info)
 
-        await self._rewrite_internal_links(written_files)
-        await self._write_index(written_files, site_info)
+    def _write_page_file(self, filepath: Path, page: FormattedPage) -> None:
+        """Format a page and write it, in one worker-thread call.
 
-        return self.output_dir
+        Each directory is created once per run rather than once per page.
+        """
+        content = self.formatter.format_single_page_output(page)
+        parent = filepath.parent
+        if parent not in self._created_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(parent)
+        filepath.write_text(content, encoding="utf-8")
 
-    def _get_filepath(self, url: str, base_url: str) -> Path:
+    def _get_filepath(self, url: str) -> Path:
         """Convert a URL to a file path."""
         parsed = urlparse(url)
         path = parsed.path.strip("/")
@@ -53,19 +129,17 @@ class MultiFileOutput:
             path = "index"
 
         # Remove file extensions that might be in the URL
-        for ext in [".html", ".htm", ".php", ".asp", ".aspx"]:
+        for ext in _STRIPPED_EXTENSIONS:
             if path.endswith(ext):
                 path = path[:-len(ext)]
 
-        path = path.replace(":", "_").replace("?", "_").replace("*", "_")
-        path = path.replace("<", "_").replace(">", "_").replace("|", "_")
-        path = path.replace('"', "_")
+        path = path.translate(_UNSAFE_FILENAME_CHARS)
 
         if not path.endswith(".md"):
             path = path + ".md"
 
         result = (self.output_dir / path).resolve()
-        if not result.is_relative_to(self.output_dir.resolve()):
+        if not result.is_relative_to(self._resolved_dir):
             # Sanitize path traversal attempts by flattening to a safe filename
             safe = path.replace("..", "_").replace("/", "_")
             result = (self.output_dir / safe).resolve()
@@ -74,7 +148,7 @@ class MultiFileOutput:
 
     async def _write_index(
         self,
-        written_files: list[tuple[FormattedPage, Path]],
+        written_files: list[_WrittenPage],
         site_info: SiteInfo,
     ) -> None:
         """Write an index file listing all pages."""
@@ -91,74 +165,86 @@ class MultiFileOutput:
         parts.append("## Pages")
         parts.append("")
 
-        for page, filepath in written_files:
-            relative_path = filepath.relative_to(self.output_dir)
+        for page in written_files:
+            relative_path = page.path.relative_to(self.output_dir)
             title = page.title or str(relative_path)
             parts.append(f"- [{title}]({relative_path})")
 
         parts.append("")
 
-        async with aiofiles.open(index_path, "w", encoding="utf-8") as f:
-            await f.write("\n".join(parts))
+        await asyncio.to_thread(index_path.write_text, "\n".join(parts), encoding="utf-8")
 
     async def _rewrite_internal_links(
-        self, written_files: list[tuple[FormattedPage, Path]]
+        self, written_files: list[_WrittenPage]
     ) -> None:
         """Rewrite markdown links that point to other extracted pages."""
         url_to_path: dict[str, Path] = {}
-        for page, filepath in written_files:
-            url_to_path[self._normalize_url_for_matching(page.url)] = filepath
+        for page in written_files:
+            url_to_path[self._normalize_url_for_matching(page.url)] = page.path
 
-        link_pattern = re.compile(r"\[([^\]]*)\]\(([^)]+)\)")
+        # One rewrite per file; where URLs collide the file holds the page
+        # appended last
+        by_path = {page.path: page for page in self._written}
+        slots = asyncio.Semaphore(_REWRITE_CONCURRENCY)
 
-        for page, filepath in written_files:
-            async with aiofiles.open(filepath, encoding="utf-8") as f:
-                content = await f.read()
+        async def rewrite(page: _WrittenPage) -> None:
+            async with slots:
+                await asyncio.to_thread(self._rewrite_page_links, page, url_to_path)
 
-            page_base_url = page.url
-            modified = False
+        await asyncio.gather(*(rewrite(page) for page in by_path.values()))
 
-            def replace_link(match: re.Match[str]) -> str:
-                nonlocal modified
-                text = match.group(1)
-                href = match.group(2)
+    def _rewrite_page_links(
+        self, page: _WrittenPage, url_to_path: dict[str, Path]
+    ) -> None:
+        """Rewrite one page file's links that point to other extracted pages.
 
-                if href.startswith(("#", "mailto:", "tel:")):
-                    return match.group(0)
+        Blocking; runs in a worker thread so the read, rewrite and write of
+        a file cost one thread hop.
+        """
+        filepath = page.path
+        content = filepath.read_text(encoding="utf-8")
 
-                resolved = urljoin(page_base_url, href)
-                resolved_no_frag = resolved.split("#")[0]
-                fragment = ""
-                if "#" in resolved:
-                    fragment = "#" + resolved.split("#", 1)[1]
+        page_base_url = page.url
+        page_domain = urlsplit(page_base_url).netloc
+        modified = False
 
-                normalized = self._normalize_url_for_matching(resolved_no_frag)
+        def replace_link(match: re.Match[str]) -> str:
+            nonlocal modified
+            text = match.group(1)
+            href = match.group(2)
 
-                page_domain = urlparse(page_base_url).netloc
-                resolved_domain = urlparse(resolved_no_frag).netloc
-                if resolved_domain and resolved_domain != page_domain:
-                    return match.group(0)
+            if href.startswith(("#", "mailto:", "tel:")):
+                return match.group(0)
 
-                if normalized in url_to_path:
-                    target_path = url_to_path[normalized]
-                    rel = Path(os.path.relpath(target_path, filepath.parent))
-                    modified = True
-                    return f"[{text}]({rel}{fragment})"
+            resolved = urljoin(page_base_url, href)
+            resolved_no_frag, hash_sign, fragment = resolved.partition("#")
+            fragment = hash_sign + fragment
 
+            resolved_domain = urlsplit(resolved_no_frag).netloc
+            if resolved_domain and resolved_domain != page_domain:
                 return match.group(0)
 
-            new_content = link_pattern.sub(replace_link, content)
+            normalized = self._normalize_url_for_matching(resolved_no_frag)
+
+            if normalized in url_to_path:
+                rel = _relative_link(url_to_path[normalized], filepath.parent)
+                modified = True
+                return f"[{text}]({rel}{fragment})"
+
+            return match.group(0)
+
+        new_content = _LINK_RE.sub(replace_link, content)
 
-            if modified:
-                async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-                    await f.write(new_content)
+        if modified:
+            filepath.write_text(new_content, encoding="utf-8")
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _normalize_url_for_matching(url: str) -> str:
         """Normalize a URL for matching purposes (strip trailing slash, fragments, query)."""
         parsed = urlparse(url)
         path = parsed.path.rstrip("/")
-        for ext in (".html", ".htm", ".php", ".asp", ".aspx"):
+        for ext in _STRIPPED_EXTENSIONS:
             if path.endswith(ext):
                 path = path[: -len(ext)]
         return f"{parsed.scheme}://{parsed.netloc}{path}".lower()
@@ -1,14 +1,19 @@
 """Single file output writer."""
 
+import asyncio
 from pathlib import Path
-
-import aiofiles  # type: ignore[import-untyped]
+from typing import BinaryIO
 
 from doc_retrieval.converter.llm_formatter import FormattedPage, LLMFormatter, SiteInfo
 
 
 class SingleFileOutput:
-    """Write all pages to a single Markdown file."""
+    """Write all pages to a single Markdown file.
+
+    Pages can be streamed in with ``open``/``append``/``close``: each page
+    section is spooled to disk as it arrives, and ``close`` writes the header
+    and table of contents followed by the sections in URL order.
+    """
 
     def __init__(
         self,
@@ -21,17 +26,91 @@ class SingleFileOutput:
             include_metadata=include_metadata,
             include_toc=include_toc,
         )
+        self._spool: BinaryIO | None = None
+        self._spool_path: Path | None = None
+        self._spool_size = 0
+        # (url, order, title, offset, length) of each spooled section
+        self._sections: list[tuple[str, int, str | None, int, int]] = []
+        self._lock = asyncio.Lock()
 
-    async def write(self, pages: list[FormattedPage], site_info: SiteInfo) -> Path:
-        """Write all pages to a single file."""
+    async def open(self) -> None:
+        """Prepare the output location and start the section spool file."""
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
 
         if self.output_path.suffix != ".md":
             self.output_path = self.output_path.with_suffix(".md")
 
-        content = self.formatter.format_combined_output(pages, site_info)
+        self._spool_path = self.output_path.with_name(self.output_path.name + ".part")
+        self._spool = await asyncio.to_thread(open, self._spool_path, "wb+")
+        self._spool_size = 0
+        self._sections = []
+
+    async def append(self, page: FormattedPage, order: int = 0) -> None:
+        """Spool one page's section; opens the writer on first use.
+
+        Sections are written sorted by URL; ``order`` (the page's discovery
+        position) breaks ties between pages with the same URL, so the output
+        doesn't depend on which one finished first.
+        """
+        data = ("\n" + self.formatter.format_combined_section(page)).encode("utf-8")
+        async with self._lock:
+            spool = self._spool or await self._open_spool()
+            await asyncio.to_thread(spool.write, data)
+            self._sections.append((page.url, order, page.title, self._spool_size, len(data)))
+            self._spool_size += len(data)
 
-        async with aiofiles.open(self.output_path, "w", encoding="utf-8") as f:
-            await f.write(content)
+    async def close(self, site_info: SiteInfo) -> Path:
+        """Write the header and spooled sections to the output file."""
+        async with self._lock:
+            spool = self._spool or await self._open_spool()
+            spool_path = self._spool_path
+            sections = sorted(self._sections, key=lambda s: s[:2])
+            header = self.formatter.format_combined_header(
+                [title for _url, _order, title, _offset, _length in sections], site_info
+            )
+            try:
+                await asyncio.to_thread(
+                    self._assemble,
+                    spool,
+                    header.encode("utf-8"),
+                    [(offset, length) for _url, _order, _title, offset, length in sections],
+                )
+            finally:
+                await asyncio.to_thread(spool.close)
+                self._spool = None
+                if spool_path is not None:
+                    spool_path.unlink(missing_ok=True)
 
         return self.output_path
+
+    async def _open_spool(self) -> BinaryIO:
+        """Open the writer and return its spool file."""
+        await self.open()
+        assert self._spool is not None
+        return self._spool
+
+    async def abort(self) -> None:
+        """Discard spooled sections without writing the output file."""
+        async with self._lock:
+            if self._spool is not None:
+                await asyncio.to_thread(self._spool.close)
+                self._spool = None
+            if self._spool_path is not None:
+                self._spool_path.unlink(missing_ok=True)
+
+    def _assemble(
+        self, spool: BinaryIO, header: bytes, segments: list[tuple[int, int]]
+    ) -> None:
+        """Write the header and spooled segments, in one worker-thread call."""
+        with open(self.output_path, "wb") as f:
+            f.write(header)
+            for offset, length in segments:
+                spool.seek(offset)
+                f.write(spool.read(length))
+
+    async def write(self, pages: list[FormattedPage], site_info: SiteInfo) -> Path:
+        """Write all pages to a single file."""
+        await self.open()
+        for page in pages:
+            await self.append(page)
+        return await self.close(site_info)
@@ -3,6 +3,24 @@
 
 from pydantic import BaseModel
 
+# Detected pattern name per (url, html length, html hash). Hashing the page
+# is one C-level pass, far cheaper than lowercasing and scanning it.
+_DETECT_CACHE: dict[tuple[str, int, int], str | None] = {}
+_DETECT_CACHE_SIZE = 64
+
+# OpenAPI plugin markers (rendered content or plugin assets) that set
+# docusaurus-openapi apart from plain Docusaurus
+_OPENAPI_MARKERS = (
+    "openapi-schema__property",
+    "openapi-left-panel__container",
+    "openapi-markdown__details",
+    "docusaurus-openapi",
+    "openapi-explorer",
+    # Static HTML markers present even before JS renders
+    "docusaurus-plugin-openapi",
+    "plugin-content-docs-api",
+)
+
 
 class SitePattern(BaseModel):
     """Configuration for a specific documentation site type."""
@@ -211,42 +229,54 @@ class PatternRegistry:
     @classmethod
     def detect(cls, url: str, html: str) -> SitePattern | None:
         """Auto-detect site type from URL or HTML content."""
-        url_lower = url.lower()
-        html_lower = html.lower() if html else ""
+        key = (url, len(html), hash(html)) if html else (url, 0, 0)
+        if key in _DETECT_CACHE:
+            name = _DETECT_CACHE[key]
+        else:
+            name = cls._detect_name(url, html)
+            if len(_DETECT_CACHE) >= _DETECT_CACHE_SIZE:
+                del _DETECT_CACHE[next(iter(_DETECT_CACHE))]
+            _DETECT_CACHE[key] = name
+        return cls._patterns.get(name) if name else None
 
+    @staticmethod
+    def _detect_name(url: str, html: str) -> str | None:
+        """Return the name of the pattern matching the URL or HTML, if any."""
+        url_lower = url.lower()
         if "readthedocs" in url_lower or ".rtfd." in url_lower:
-            return cls._patterns.get("readthedocs")
+            return "readthedocs"
+
+        # Case-insensitive match of a lowercase keyword. Signatures usually
+        # appear in lowercase, so the exact check almost always settles it
+        # and the page is only lowercased (once) when it doesn't.
+        html = html or ""
+        html_lower: str | None = None
+
+        def has(keyword: str) -> bool:
+            nonlocal html_lower
+            if keyword in html:
+                return True
+            if html_lower is None:
+                html_lower = html.lower()
+            return keyword in html_lower
 
         # Check HTML content for framework signatures
         # Docusaurus OpenAPI must be checked before generic Docusaurus
-        if "docusaurus" in html_lower or "__docusaurus" in html:
-            # Check for OpenAPI plugin markers (rendered content or plugin assets)
-            openapi_markers = [
-                "openapi-schema__property",
-                "openapi-left-panel__container",
-                "openapi-markdown__details",
-                "docusaurus-openapi",
-                "openapi-explorer",
-                # Static HTML markers present even before JS renders
-                "docusaurus-plugin-openapi",
-                "plugin-content-docs-api",
-            ]
-            if any(marker in html for marker in openapi_markers):
-                return cls._patterns.get("docusaurus-openapi")
-
-        if "docusaurus" in html_lower or "__docusaurus" in html:
-            return cls._patterns.get("docusaurus")
-
-        if "gitbook" in html_lower or "data-testid=\"page." in html:
-            return cls._patterns.get("gitbook")
-
-        if "mkdocs" in html_lower or "md-content" in html:
-            return cls._patterns.get("mkdocs")
-
-        if "sphinx" in html_lower or "sphinxsidebar" in html:
-            return cls._patterns.get("sphinx")
-
-        if "vitepress" in html_lower or "vp-doc" in html:
-            return cls._patterns.get("vitepress")
+        if has("docusaurus"):
+            if any(marker in html for marker in _OPENAPI_MARKERS):
+                return "docusaurus-openapi"
+            return "docusaurus"
+
+        if "data-testid=\"page." in html or has("gitbook"):
+            return "gitbook"
+
+        if "md-content" in html or has("mkdocs"):
+            return "mkdocs"
+
+        if "sphinxsidebar" in html or has("sphinx"):
+            return "sphinx"
+
+        if "vp-doc" in html or has("vitepress"):
+            return "vitepress"
 
         return None
@@ -1,11 +1,20 @@
 """Utility functions and classes."""
 
-from doc_retrieval.utils.rate_limiter import RateLimiter
-from doc_retrieval.utils.url_utils import is_same_domain, normalize_url, url_to_filename
+from doc_retrieval.utils.rate_limiter import RateLimiter, TokenBucket
+from doc_retrieval.utils.regex_cache import compiled
+from doc_retrieval.utils.url_utils import (
+    SameDomainChecker,
+    is_same_domain,
+    normalize_url,
+    url_to_filename,
+)
 
 __all__ = [
     "RateLimiter",
+    "TokenBucket",
+    "compiled",
     "normalize_url",
     "is_same_domain",
+    "SameDomainChecker",
     "url_to_filename",
 ]
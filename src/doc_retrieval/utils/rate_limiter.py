@@ -1,51 +1,270 @@
 """Rate limiting for polite crawling."""
 
 import asyncio
+import random
+from collections import deque
 from time import monotonic
 
+_WINDOW_SECONDS = 60.0  # Span of the requests-per-minute window
+_MAX_PAUSE = 60.0  # Longest a server's reset hint may pause new requests
+_LOW_REMAINING_FRACTION = 0.1  # Pause once this share of the quota is left
+_LOW_REMAINING_FLOOR = 2
+_LATENCY_WINDOW = 20  # Fetch latencies averaged for concurrency control
+_LATENCY_TOLERANCE = 2.0  # Mean latency over this multiple of the best is congestion
+_CONCURRENCY_STEP = 0.5  # Additive increase per uncongested success
+
+
+class TokenBucket:
+    """Token bucket allowing bursts of ``capacity`` at a sustained ``rate``.
+
+    Tokens accrue at ``rate`` per second while idle, up to ``capacity``.
+    A ``rate`` of zero means unlimited.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = monotonic()
+
+    async def acquire(self, n: float = 1) -> None:
+        """Take ``n`` tokens, sleeping until enough have accrued.
+
+        Tokens are reserved up front and the balance may go negative, so
+        concurrent callers are scheduled in call order without a lock: each
+        one sleeps off the debt accumulated ahead of it.
+        """
+        if self.rate <= 0:
+            return
+        now = monotonic()
+        self._tokens = (
+            min(self.capacity, self._tokens + (now - self._last) * self.rate) - n
+        )
+        self._last = now
+        if self._tokens >= 0:
+            return
+        try:
+            await asyncio.sleep(-self._tokens / self.rate)
+        except asyncio.CancelledError:
+            # Give the reservation back so later callers aren't held up
+            self._tokens += n
+            raise
+
+    def drain(self) -> None:
+        """Discard accrued tokens so the next burst starts from empty."""
+        self._tokens = min(self._tokens, 0.0)
+        self._last = monotonic()
+
 
 class RateLimiter:
-    """Rate limiter with semaphore-based concurrency and staggered delays.
+    """Rate limiter with adaptive concurrency and a token bucket.
 
-    Ensures at most ``max_concurrent`` requests are in flight and that new
-    requests start at least ``delay_seconds`` apart.
+    Ensures at most ``max_concurrent`` requests are in flight and that
+    requests start at a sustained rate of one per ``delay_seconds``, with
+    idle time banked for bursts of up to ``max_concurrent`` starts.
+    The concurrency limit is steered AIMD-style between 1 and
+    ``max_concurrent``: it grows by half a slot per success while latency
+    stays near the best seen, and halves on 429s or rising latency.
+    With ``requests_per_minute`` set, starts are also capped over a sliding
+    one-minute window, and ``observe_limits`` pauses new starts when the
+    server reports its quota is nearly spent.
     """
 
     _MAX_DELAY = 5.0  # Upper bound for adaptive back-off
 
-    def __init__(self, delay_seconds: float = 0.2, max_concurrent: int = 3):
+    def __init__(
+        self,
+        delay_seconds: float = 0.2,
+        max_concurrent: int = 3,
+        requests_per_minute: int = 0,
+    ):
         self.delay_seconds = delay_seconds
+        self.requests_per_minute = requests_per_minute
         self._original_delay = delay_seconds
-        self._semaphore = asyncio.Semaphore(max_concurrent)
-        self._last_request_time: float = 0.0
-        self._lock = asyncio.Lock()
-        self.backoff_count: int = 0
+        self.max_concurrent = max_concurrent
+        self.concurrency: float = float(max_concurrent)
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._best_latency: float | None = None
+        self._bucket = TokenBucket(self._rate(), max_concurrent)
+        self.backoff_count: int = 0  # Back-offs on 429/503 responses
+        self.quota_slowdowns: int = 0  # Slow-downs asked for by rate-limit headers
         self.peak_delay: float = delay_seconds
+        self._window: deque[float] = deque()  # Start times within the last minute
+        self._pause_until = 0.0
+        self._quota_limit = 0  # Largest remaining-count seen, taken as the quota
 
     async def acquire(self) -> None:
-        """Acquire a concurrency slot, then enforce minimum delay between starts."""
-        await self._semaphore.acquire()
-        async with self._lock:
+        """Acquire a concurrency slot, then wait for a start token."""
+        await self._acquire_slot()
+        try:
+            await self._wait_for_window()
+            self._bucket.rate = self._rate()
+            await self._bucket.acquire()
+            # A back-off while we slept on the bucket applies to us too
+            await self._wait_for_pause()
+        except BaseException:
+            self.release()
+            raise
+
+    async def _acquire_slot(self) -> None:
+        """Wait, first come first served, until under the concurrency limit."""
+        if not self._waiters and self._in_flight < int(self.concurrency):
+            self._in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled; pass
+                # it on to the next waiter
+                self.release()
+            elif waiter in self._waiters:
+                # _wake_waiters may already have popped and skipped it
+                self._waiters.remove(waiter)
+            raise
+
+    def _wake_waiters(self) -> None:
+        """Hand free slots to queued callers, oldest first."""
+        while self._waiters and self._in_flight < int(self.concurrency):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    async def _wait_for_pause(self) -> None:
+        """Sleep until any pause set by a back-off or the server has passed."""
+        while (remaining := self._pause_until - monotonic()) > 0:
+            await asyncio.sleep(remaining)
+
+    async def _wait_for_window(self) -> None:
+        """Sleep out any pause and the per-minute cap."""
+        while True:
+            await self._wait_for_pause()
             now = monotonic()
-            elapsed = now - self._last_request_time
-            wait_time = self.delay_seconds - elapsed
+            if self.requests_per_minute <= 0:
+                return
+            window = self._window
+            while window and window[0] <= now - _WINDOW_SECONDS:
+                window.popleft()
+            if len(window) < self.requests_per_minute:
+                window.append(now)
+                return
+            await asyncio.sleep(window[0] + _WINDOW_SECONDS - now)
+
+    def observe_limits(
+        self,
+        remaining: int | None,
+        reset: float | None,
+        retry_after: float | None = None,
+    ) -> None:
+        """React to the rate-limit state a server reported on a response.
 
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
+        ``retry_after`` pauses new starts for that long. When ``remaining``
+        drops to the last tenth of the quota (at least two requests), new
+        starts pause until ``reset`` or, with no reset hint, the delay backs
+        off instead. Pauses are capped at ``_MAX_PAUSE`` seconds.
+        """
+        now = monotonic()
+        if retry_after is not None and retry_after > 0:
+            self._pause(now + min(retry_after, _MAX_PAUSE))
+        if remaining is None:
+            return
+        self._quota_limit = max(self._quota_limit, remaining)
+        threshold = max(
+            _LOW_REMAINING_FLOOR, self._quota_limit * _LOW_REMAINING_FRACTION
+        )
+        if remaining > threshold:
+            return
+        if reset is not None:
+            until = now + min(reset, _MAX_PAUSE)
+            if until > self._pause_until:
+                self._pause(until)
+                self.quota_slowdowns += 1
+        elif not self.is_throttled:
+            self._grow_delay()
+            self.quota_slowdowns += 1
 
-            self._last_request_time = monotonic()
+    def _pause(self, until: float) -> None:
+        """Hold new starts until the monotonic time ``until``."""
+        if until > self._pause_until:
+            self._pause_until = until
+            self._bucket.drain()
 
     def release(self) -> None:
         """Release a concurrency slot."""
-        self._semaphore.release()
+        self._in_flight -= 1
+        self._wake_waiters()
 
-    def back_off(self) -> None:
-        """Double the delay between requests (capped at _MAX_DELAY).
+    async def __aenter__(self) -> "RateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+    def record_latency(self, seconds: float) -> None:
+        """Add one fetch's latency to the window used by ``record_success``."""
+        self._latencies.append(seconds)
 
-        Called when a 429 is encountered so all subsequent requests slow down.
+    def record_success(self) -> None:
+        """Additively raise concurrency unless latency shows congestion.
+
+        The window's mean latency is compared with the best mean seen so
+        far; beyond ``_LATENCY_TOLERANCE`` times that, concurrency halves
+        instead. The delay also eases back toward its configured value.
         """
-        self.delay_seconds = min(self.delay_seconds * 2, self._MAX_DELAY)
+        self.ease_off()
+        if not self._latencies:
+            return
+        mean = sum(self._latencies) / len(self._latencies)
+        if self._best_latency is None or mean < self._best_latency:
+            self._best_latency = mean
+        if mean > self._best_latency * _LATENCY_TOLERANCE:
+            self._decrease_concurrency()
+        else:
+            self.concurrency = min(
+                self.concurrency + _CONCURRENCY_STEP, float(self.max_concurrent)
+            )
+            self._wake_waiters()
+
+    def record_error(self, status_code: int) -> None:
+        """Back off delay and halve concurrency on 429 / 503 responses."""
+        if status_code in (429, 503):
+            self.back_off()
+            self._decrease_concurrency()
+
+    def _decrease_concurrency(self) -> None:
+        """Halve the concurrency limit, never below one slot.
+
+        Requests already in flight finish normally; new ones queue until
+        enough have completed. The latency window restarts so the cut is
+        judged on fresh samples.
+        """
+        self.concurrency = max(self.concurrency / 2, 1.0)
+        self._latencies.clear()
+
+    def back_off(self) -> None:
+        """Slow down after a 429 / 503 so all subsequent requests wait longer."""
+        self._grow_delay()
         self.backoff_count += 1
+
+    def _grow_delay(self) -> None:
+        """Grow the delay between requests with decorrelated jitter.
+
+        The new delay is drawn uniformly between the configured delay and
+        three times the current one (capped at _MAX_DELAY), so workers that
+        hit a 429 together don't all retry on the same boundary.
+        Starts already waiting are held for one new delay as well, so the
+        slower pace takes effect immediately.
+        """
+        self.delay_seconds = min(
+            random.uniform(self._original_delay, self.delay_seconds * 3), self._MAX_DELAY
+        )
+        self._pause(monotonic() + self.delay_seconds)
         self.peak_delay = max(self.peak_delay, self.delay_seconds)
 
     @property
@@ -59,3 +278,7 @@ class RateLimiter:
         Called on successful fetches to gradually restore normal pace.
         """
         self.delay_seconds = max(self.delay_seconds / 2, self._original_delay)
+
+    def _rate(self) -> float:
+        """Sustained request starts per second for the current delay."""
+        return 1.0 / self.delay_seconds if self.delay_seconds > 0 else 0.0
@@ -0,0 +1,15 @@
+"""Process-wide cache of compiled regular expressions."""
+
+import re
+from functools import lru_cache
+
+
+@lru_cache(maxsize=512)
+def compiled(pattern: str, flags: int = 0) -> re.Pattern[str]:
+    """Compile a pattern once per process, however many callers use it.
+
+    User URL filters are compiled by interactive mode, every discoverer and
+    the orchestrator; sharing this cache means each string compiles once.
+    Hit rates are available via ``compiled.cache_info()``.
+    """
+    return re.compile(pattern, flags)
@@ -1,13 +1,60 @@
 """URL manipulation utilities."""
 
 import re
-from urllib.parse import urljoin, urlparse, urlunparse
+from functools import lru_cache
+from urllib.parse import ParseResult, urljoin, urlparse, urlunparse
 
+# Characters urlparse strips or treats specially; URLs containing any of them
+# take the full parse path in normalize_url
+_NORMALIZE_SLOW_CHARS = re.compile(r"[\x00-\x20;\\\[]")
+_SCHEME_RE = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*")
 
+# Asset file extensions and asset directories that is_doc_url rejects,
+# matched against the lowercased path in one scan
+_ASSET_PATH_RE = re.compile(
+    r"\.(?:png|jpe?g|gif|svg|ico|webp|css|js|woff2?|ttf|eot|pdf|zip|tar|gz"
+    r"|xml|json|ya?ml)\Z"
+    r"|/(?:assets|static|images|img|css|js|fonts|_next|_nuxt|\.well-known)/"
+)
+
+# Characters not allowed in filenames on common filesystems
+_UNSAFE_FILENAME_CHARS = str.maketrans(dict.fromkeys('<>:"|?*', "_"))
+
+
+@lru_cache(maxsize=8192)
+def _parse(url: str) -> ParseResult:
+    """Parse a URL once for all the helpers below.
+
+    A crawled link is checked for domain, asset type and normalized in turn,
+    and the crawl's base URL is parsed for every link on every page.
+    """
+    return urlparse(url)
+
+
+# Discoverers normalize each URL for their own dedup and the orchestrator
+# normalizes it again moments later, so even a small cache always hits
+@lru_cache(maxsize=4096)
 def normalize_url(url: str) -> str:
-    """Normalize a URL by removing fragments and trailing slashes."""
-    parsed = urlparse(url)
-    normalized = parsed._replace(fragment="")
+    """Normalize a URL by lowercasing the host and removing fragments and trailing slashes."""
+    # Fast path: slice the string directly instead of parsing and rebuilding
+    # it, for the plain absolute URLs that discovery produces
+    scheme, sep, rest = url.partition("://")
+    rest, _, query = rest.partition("#")[0].partition("?")
+    host, slash, path = rest.partition("/")
+    if (
+        host
+        and sep
+        and _SCHEME_RE.fullmatch(scheme)
+        and not _NORMALIZE_SLOW_CHARS.search(url)
+    ):
+        path = slash + path
+        if path != "/":
+            path = path.rstrip("/")
+        normalized_url = f"{scheme.lower()}://{host.lower()}{path}"
+        return f"{normalized_url}?{query}" if query else normalized_url
+
+    parsed = _parse(url)
+    normalized = parsed._replace(netloc=parsed.netloc.lower(), fragment="")
     path = normalized.path.rstrip("/") if normalized.path != "/" else "/"
     normalized = normalized._replace(path=path)
     return urlunparse(normalized)
@@ -15,14 +62,41 @@ def normalize_url(url: str) -> str:
 
 def is_same_domain(url1: str, url2: str) -> bool:
     """Check if two URLs are on the same domain."""
-    parsed1 = urlparse(url1)
-    parsed2 = urlparse(url2)
+    parsed1 = _parse(url1)
+    parsed2 = _parse(url2)
     return parsed1.netloc.lower() == parsed2.netloc.lower()
 
 
+class SameDomainChecker:
+    """Test many URLs against one base URL's domain.
+
+    The base is parsed once. URLs that start with ``http(s)://<netloc>/``
+    match without parsing; anything else (other case, no trailing slash,
+    credentials, ports) falls back to comparing parsed netlocs.
+    """
+
+    __slots__ = ("_http_prefix", "_https_prefix", "_netloc")
+
+    def __init__(self, base_url: str):
+        self._netloc = _parse(base_url).netloc.lower()
+        self._http_prefix = f"http://{self._netloc}/"
+        self._https_prefix = f"https://{self._netloc}/"
+
+    def __call__(self, url: str) -> bool:
+        if url.startswith(self._https_prefix) or url.startswith(self._http_prefix):
+            return True
+        return _parse(url).netloc.lower() == self._netloc
+
+
 def get_base_domain(url: str) -> str:
     """Extract the domain from a URL."""
-    return urlparse(url).netloc.lower()
+    # Fast path: the netloc runs from "://" to the first "/", "?" or "#"
+    scheme, sep, rest = url.partition("://")
+    if sep and _SCHEME_RE.fullmatch(scheme) and not _NORMALIZE_SLOW_CHARS.search(url):
+        for delimiter in "/?#":
+            rest = rest.partition(delimiter)[0]
+        return rest.lower()
+    return _parse(url).netloc.lower()
 
 
 def make_absolute(base_url: str, href: str) -> str:
@@ -32,7 +106,7 @@ def make_absolute(base_url: str, href: str) -> str:
 
 def url_to_filename(url: str, base_url: str) -> str:
     """Convert a URL to a safe filename preserving path structure."""
-    parsed = urlparse(url)
+    parsed = _parse(url)
     path = parsed.path.strip("/")
 
     if not path:
@@ -42,7 +116,7 @@ def url_to_filename(url: str, base_url: str) -> str:
     parts = [p for p in path.split("/") if p and p != ".."]
     path = "/".join(parts)
 
-    path = re.sub(r"[<>:\"|?*]", "_", path)
+    path = path.translate(_UNSAFE_FILENAME_CHARS)
 
     if not path.endswith(".md"):
         path = path + ".md"
@@ -52,28 +126,4 @@ def url_to_filename(url: str, base_url: str) -> str:
 
 def is_doc_url(url: str) -> bool:
     """Check if a URL looks like a documentation page (not an asset)."""
-    parsed = urlparse(url)
-    path = parsed.path.lower()
-
-    skip_extensions = {
-        ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".webp",
-        ".css", ".js", ".woff", ".woff2", ".ttf", ".eot",
-        ".pdf", ".zip", ".tar", ".gz",
-        ".xml", ".json", ".yaml", ".yml",
-    }
-
-    for ext in skip_extensions:
-        if path.endswith(ext):
-            return False
-
-    skip_paths = {
-        "/assets/", "/static/", "/images/", "/img/",
-        "/css/", "/js/", "/fonts/",
-        "/_next/", "/_nuxt/", "/.well-known/",
-    }
-
-    for skip in skip_paths:
-        if skip in path:
-            return False
-
-    return True
+    return _ASSET_PATH_RE.search(_parse(url).path.lower()) is None
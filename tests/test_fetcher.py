@@ -0,0 +1,49 @@
+"""Tests for fetch results and the HTTP fetcher."""
+
+import httpx
+import pytest
+
+from doc_retrieval.config import FetcherConfig
+from doc_retrieval.fetcher.base import FetchResult
+from doc_retrieval.fetcher.http_fetcher import HttpFetcher
+
+
+def test_html_decodes_with_declared_charset():
+    result = FetchResult(
+        url="https://d.example/",
+        final_url="https://d.example/",
+        html_bytes="café".encode("latin-1"),
+        encoding="latin-1",
+        status_code=200,
+    )
+    assert result.html == "café"
+
+
+def test_html_defaults_to_utf8_and_replaces_bad_bytes():
+    result = FetchResult(
+        url="https://d.example/",
+        final_url="https://d.example/",
+        html_bytes=b"caf\xc3\xa9 \xff",
+        status_code=200,
+    )
+    assert result.html == "café �"
+
+
+@pytest.mark.parametrize("charset", ["utf8mb4", "x-user-defined", "not a charset"])
+async def test_http_fetcher_ignores_unknown_charset(charset):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            content="<p>café</p>".encode(),
+            headers={"content-type": f"text/html; charset={charset}"},
+        )
+
+    fetcher = HttpFetcher(FetcherConfig())
+    fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        result = await fetcher.fetch("https://d.example/")
+    finally:
+        await fetcher._client.aclose()
+    assert result.success
+    assert result.encoding is None
+    assert result.html == "<p>café</p>"
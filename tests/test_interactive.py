@@ -0,0 +1,64 @@
+"""Tests for the interactive sitemap probe."""
+
+import httpx
+import pytest
+
+from doc_retrieval import interactive
+from doc_retrieval.interactive import InteractiveExtractor
+
+
+def _extractor(monkeypatch, handler) -> InteractiveExtractor:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(interactive, "_SITEMAP_CACHE", {})
+    monkeypatch.setattr(InteractiveExtractor, "_get_client", classmethod(lambda cls: client))
+    return InteractiveExtractor()
+
+
+def _robots(body: str | None, status: int = 404):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/robots.txt" and body is not None:
+            return httpx.Response(200, text=body)
+        return httpx.Response(status)
+
+    return handler
+
+
+@pytest.mark.parametrize(
+    ("handler", "expected"),
+    [
+        (_robots(None), False),
+        (_robots("User-agent: *\nDisallow:", status=410), False),
+        (_robots("Sitemap: https://d.example/map.xml"), True),
+        # 403 and 5xx don't prove there is no sitemap
+        (_robots(None, status=403), True),
+        (_robots(None, status=503), True),
+    ],
+)
+async def test_probe_sitemap_answers(monkeypatch, handler, expected):
+    extractor = _extractor(monkeypatch, handler)
+    assert await extractor._probe_sitemap("https://d.example/docs/") is expected
+
+
+async def test_probe_sitemap_falls_back_to_get_on_405(monkeypatch):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/sitemap.xml":
+            return httpx.Response(405 if request.method == "HEAD" else 200)
+        return httpx.Response(404)
+
+    extractor = _extractor(monkeypatch, handler)
+    assert await extractor._probe_sitemap("https://d.example/docs/")
+
+
+async def test_probe_sitemap_caches_definite_answer(monkeypatch):
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(404)
+
+    extractor = _extractor(monkeypatch, handler)
+    assert not await extractor._probe_sitemap("https://d.example/docs/")
+    first = calls
+    assert not await extractor._probe_sitemap("https://d.example/other/")
+    assert calls == first
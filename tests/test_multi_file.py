@@ -0,0 +1,35 @@
+"""Tests for multi-file output link rewriting."""
+
+import asyncio
+
+from doc_retrieval.converter.llm_formatter import FormattedPage, SiteInfo
+from doc_retrieval.output.multi_file import MultiFileOutput
+
+
+async def test_concurrent_appends_then_close_rewrites_links(tmp_path):
+    writer = MultiFileOutput(tmp_path, include_metadata=False)
+    await writer.open()
+    pages = [
+        FormattedPage(
+            url="https://d.example/guide/a",
+            title="A",
+            markdown="See [B](https://d.example/guide/b/) and [ext](https://other.example/b).",
+        ),
+        FormattedPage(
+            url="https://d.example/guide/b",
+            title="B",
+            markdown="Back to [A](/guide/a#top).",
+        ),
+        FormattedPage(url="https://d.example/start", title="Start", markdown="[Guide](guide/a)"),
+    ]
+    await asyncio.gather(*(writer.append(page) for page in pages))
+    await writer.close(SiteInfo(base_url="https://d.example/"))
+
+    a = (tmp_path / "guide" / "a.md").read_text(encoding="utf-8")
+    assert "[B](b.md)" in a
+    assert "[ext](https://other.example/b)" in a
+    assert "[A](a.md#top)" in (tmp_path / "guide" / "b.md").read_text(encoding="utf-8")
+    assert "[Guide](guide/a.md)" in (tmp_path / "start.md").read_text(encoding="utf-8")
+
+    index = (tmp_path / "index.md").read_text(encoding="utf-8")
+    assert index.index("[A]") < index.index("[B]") < index.index("[Start]")
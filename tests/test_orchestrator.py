@@ -0,0 +1,181 @@
+"""Tests for the orchestrator's discovery/fetch pipeline."""
+
+import asyncio
+import io
+
+import pytest
+from rich.console import Console
+
+from doc_retrieval.config import AppConfig, FetcherConfig
+from doc_retrieval.discovery.base import DiscoveredURL
+from doc_retrieval.extractor import ContentExtractor
+from doc_retrieval.fetcher.base import BaseFetcher, FetchResult
+from doc_retrieval.orchestrator import Orchestrator
+
+_HTML = "<html><body><main><h1>{title}</h1><p>{body}</p></main></body></html>"
+
+
+class _Discoverer:
+    """Yields the given URLs, then optionally blocks until cancelled."""
+
+    def __init__(self, urls: list[str], block: bool = False):
+        self.urls = urls
+        self.block = block
+        self.closed = False
+
+    async def discover(self):
+        try:
+            for url in self.urls:
+                yield DiscoveredURL(url=url)
+            if self.block:
+                await asyncio.Event().wait()
+        finally:
+            self.closed = True
+
+
+class _Fetcher(BaseFetcher):
+    """Serves a small article for every URL after ``delay`` seconds."""
+
+    def __init__(self, delay: float = 0.0, enter_error: Exception | None = None):
+        super().__init__(FetcherConfig(use_js=False))
+        self.delay = delay
+        self.enter_error = enter_error
+
+    async def __aenter__(self):
+        if self.enter_error is not None:
+            await asyncio.sleep(0.05)
+            raise self.enter_error
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def fetch(self, url: str) -> FetchResult:
+        await asyncio.sleep(self.delay)
+        slug = url.rstrip("/").rsplit("/", 1)[-1]
+        html = _HTML.format(title=slug, body=f"{slug} " + "documentation text " * 20)
+        return FetchResult(url=url, final_url=url, html_bytes=html.encode(), status_code=200)
+
+
+def _orchestrator(tmp_path, discoverer, fetcher, max_concurrent: int = 1) -> Orchestrator:
+    config = AppConfig(
+        base_url="https://d.example/docs/",
+        fetcher=FetcherConfig(use_js=False),
+        output={"path": tmp_path / "out.md", "include_metadata": False},
+        rate_limit={"delay_seconds": 0, "max_concurrent": max_concurrent, "max_retries": 0},
+    )
+    orchestrator = Orchestrator(config, console=Console(file=io.StringIO()))
+    orchestrator._create_discoverer = lambda: discoverer  # type: ignore[method-assign]
+    orchestrator._create_fetcher = lambda: fetcher  # type: ignore[method-assign]
+    return orchestrator
+
+
+async def test_pipeline_extracts_every_discovered_page(tmp_path):
+    urls = [f"https://d.example/docs/page{i}" for i in range(12)]
+    discoverer = _Discoverer(urls + [urls[0] + "/"])
+    orchestrator = _orchestrator(tmp_path, discoverer, _Fetcher(), max_concurrent=3)
+
+    result = await orchestrator.run()
+
+    assert result.success_count == 12
+    assert not result.errors
+    assert discoverer.closed
+    text = (tmp_path / "out.md").read_text(encoding="utf-8")
+    positions = [text.index(f"page{i} documentation") for i in (0, 1, 10, 11)]
+    assert positions == sorted(positions)
+
+
+async def test_discovery_time_excludes_waiting_for_workers(tmp_path):
+    # One worker and a queue of two: the last URL is queued at once, but
+    # the sentinels only fit after the worker has taken pages off the queue
+    urls = [f"https://d.example/docs/page{i}" for i in range(3)]
+    orchestrator = _orchestrator(tmp_path, _Discoverer(urls), _Fetcher(delay=0.1))
+
+    result = await orchestrator.run()
+
+    assert result.success_count == 3
+    assert result.discovery_duration < 0.05
+
+
+async def test_cancel_with_full_queue_does_not_hang(tmp_path):
+    urls = [f"https://d.example/docs/page{i}" for i in range(50)]
+    discoverer = _Discoverer(urls)
+    orchestrator = _orchestrator(tmp_path, discoverer, _Fetcher(delay=60))
+
+    run = asyncio.create_task(orchestrator.run())
+    await asyncio.sleep(0.2)
+    run.cancel()
+    await asyncio.wait([run], timeout=2)
+    assert run.done()
+    with pytest.raises(asyncio.CancelledError):
+        await run
+    assert not (tmp_path / "out.md.part").exists()
+
+
+async def test_failed_start_with_full_queue_leaves_no_producer(tmp_path):
+    urls = [f"https://d.example/docs/page{i}" for i in range(50)]
+    fetcher = _Fetcher(enter_error=RuntimeError("no browser"))
+    orchestrator = _orchestrator(tmp_path, _Discoverer(urls), fetcher)
+
+    with pytest.raises(RuntimeError, match="no browser"):
+        await orchestrator.run()
+    await asyncio.sleep(0.05)
+    # The cancelled producer must not stay blocked putting sentinels into
+    # a full queue that no worker will ever drain
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+async def test_failed_fetcher_start_stops_discovery(tmp_path):
+    discoverer = _Discoverer(["https://d.example/docs/a"], block=True)
+    fetcher = _Fetcher(enter_error=RuntimeError("no browser"))
+    orchestrator = _orchestrator(tmp_path, discoverer, fetcher)
+
+    with pytest.raises(RuntimeError, match="no browser"):
+        await orchestrator.run()
+    # Discovery was still running; it is cancelled and finished by the time
+    # run() re-raises
+    assert discoverer.closed
+    assert not (tmp_path / "out.md.part").exists()
+
+
+class _CountingExtractor(ContentExtractor):
+    def __init__(self, config):
+        super().__init__(config)
+        self.calls = 0
+
+    def extract(self, html, url, encoding=None):
+        self.calls += 1
+        return super().extract(html, url, encoding)
+
+
+def _result(url: str, html: str) -> FetchResult:
+    return FetchResult(url=url, final_url=url, html_bytes=html.encode(), status_code=200)
+
+
+async def test_extract_cache_shares_selector_matches_across_urls(tmp_path):
+    orchestrator = _orchestrator(tmp_path, _Discoverer([]), _Fetcher())
+    extractor = _CountingExtractor(orchestrator.config.extractor)
+    html = _HTML.format(title="Alias", body="documentation text " * 20)
+
+    first = await orchestrator._extract(
+        extractor, _result("https://d.example/a", html), "https://d.example/a"
+    )
+    second = await orchestrator._extract(
+        extractor, _result("https://d.example/b", html), "https://d.example/b"
+    )
+
+    assert first is not None and first.extraction_method == "css_selector"
+    assert second is first
+    assert extractor.calls == 1
+
+
+async def test_extract_cache_keys_fallbacks_by_url(tmp_path):
+    orchestrator = _orchestrator(tmp_path, _Discoverer([]), _Fetcher())
+    extractor = _CountingExtractor(orchestrator.config.extractor)
+    # No content selector matches, so extraction falls back past the soup pass
+    html = "<html><body><div><p>" + "documentation text " * 20 + "</p></div></body></html>"
+
+    for url in ("https://d.example/a", "https://d.example/b", "https://d.example/a"):
+        content = await orchestrator._extract(extractor, _result(url, html), url)
+        assert content is not None and content.extraction_method != "css_selector"
+    assert extractor.calls == 2
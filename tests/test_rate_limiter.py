@@ -0,0 +1,234 @@
+"""Tests for the token bucket and rate limiter."""
+
+import asyncio
+from datetime import datetime, timezone
+from time import monotonic
+
+import pytest
+
+from doc_retrieval.fetcher.base import BaseFetcher
+from doc_retrieval.utils import rate_limiter as rl
+from doc_retrieval.utils.rate_limiter import RateLimiter, TokenBucket
+
+
+async def test_token_bucket_spaces_starts_after_burst():
+    bucket = TokenBucket(rate=20, capacity=2)
+    start = monotonic()
+    for _ in range(4):
+        await bucket.acquire()
+    # Two from the burst, then two more at 1/20 s each
+    assert monotonic() - start == pytest.approx(0.1, abs=0.04)
+
+
+async def test_token_bucket_zero_rate_is_unlimited():
+    bucket = TokenBucket(rate=0, capacity=1)
+    start = monotonic()
+    for _ in range(100):
+        await bucket.acquire()
+    assert monotonic() - start < 0.05
+
+
+async def test_token_bucket_cancel_refunds_reservation():
+    bucket = TokenBucket(rate=10, capacity=1)
+    await bucket.acquire()
+    waiter = asyncio.create_task(bucket.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    start = monotonic()
+    await bucket.acquire()
+    assert monotonic() - start < 0.15
+
+
+async def test_limiter_caps_in_flight_requests():
+    limiter = RateLimiter(delay_seconds=0, max_concurrent=2)
+    active = peak = 0
+
+    async def task():
+        nonlocal active, peak
+        await limiter.acquire()
+        try:
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+        finally:
+            limiter.release()
+
+    await asyncio.gather(*(task() for _ in range(8)))
+    assert peak == 2
+    assert limiter._in_flight == 0
+
+
+async def test_limiter_cancelled_waiter_frees_nothing():
+    limiter = RateLimiter(delay_seconds=0, max_concurrent=1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    limiter.release()
+    assert limiter._in_flight == 0
+    assert not limiter._waiters
+
+
+async def test_limiter_waiter_cancelled_after_wake_passes_slot_on():
+    limiter = RateLimiter(delay_seconds=0, max_concurrent=1)
+    await limiter.acquire()
+    woken = asyncio.create_task(limiter.acquire())
+    queued = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    limiter.release()
+    # Cancelled after its slot was handed over but before it resumed
+    woken.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await woken
+    await asyncio.wait_for(queued, timeout=1)
+    assert limiter._in_flight == 1
+
+
+async def test_limiter_waiter_cancelled_before_wake_is_skipped():
+    limiter = RateLimiter(delay_seconds=0, max_concurrent=1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    # The release pops the cancelled waiter before its task resumes
+    limiter.release()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limiter._in_flight == 0
+    assert not limiter._waiters
+
+
+def test_aimd_halves_on_429_and_grows_additively():
+    limiter = RateLimiter(delay_seconds=0, max_concurrent=4)
+    limiter.record_error(429)
+    assert limiter.concurrency == 2
+    limiter.record_error(404)
+    assert limiter.concurrency == 2
+    for _ in range(2):
+        limiter.record_latency(0.1)
+        limiter.record_success()
+    assert limiter.concurrency == 3
+    for _ in range(10):
+        limiter.record_latency(0.1)
+        limiter.record_success()
+    assert limiter.concurrency == 4
+
+
+def test_aimd_halves_when_latency_rises():
+    limiter = RateLimiter(delay_seconds=0, max_concurrent=8)
+    limiter.record_latency(0.1)
+    limiter.record_success()
+    limiter.record_latency(1.0)
+    limiter.record_success()
+    assert limiter.concurrency == 4
+    # The window restarts after a cut
+    assert not limiter._latencies
+
+
+async def test_limiter_context_manager_releases_on_error():
+    limiter = RateLimiter(delay_seconds=0, max_concurrent=1)
+    with pytest.raises(RuntimeError):
+        async with limiter:
+            assert limiter._in_flight == 1
+            raise RuntimeError("boom")
+    assert limiter._in_flight == 0
+
+
+def test_back_off_is_jittered_within_bounds(monkeypatch):
+    limiter = RateLimiter(delay_seconds=0.2, max_concurrent=2)
+    monkeypatch.setattr(rl.random, "uniform", lambda low, high: high)
+    limiter.back_off()
+    assert limiter.delay_seconds == pytest.approx(0.6)
+    limiter.back_off()
+    limiter.back_off()
+    assert limiter.delay_seconds == RateLimiter._MAX_DELAY
+    assert limiter.is_throttled
+    assert limiter.backoff_count == 3
+    for _ in range(10):
+        limiter.ease_off()
+    assert limiter.delay_seconds == 0.2
+
+
+async def test_back_off_holds_starts_already_waiting():
+    limiter = RateLimiter(delay_seconds=0.05, max_concurrent=4)
+    for _ in range(4):
+        await limiter.acquire()
+        limiter.release()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0.01)
+    backed_off = monotonic()
+    limiter.back_off()
+    await waiter
+    limiter.release()
+    assert monotonic() - backed_off >= limiter.delay_seconds - 0.01
+
+
+async def test_requests_per_minute_window(monkeypatch):
+    monkeypatch.setattr(rl, "_WINDOW_SECONDS", 0.2)
+    limiter = RateLimiter(delay_seconds=0, max_concurrent=5, requests_per_minute=2)
+    start = monotonic()
+    for _ in range(3):
+        await limiter.acquire()
+        limiter.release()
+    assert monotonic() - start == pytest.approx(0.2, abs=0.06)
+
+
+async def test_observe_limits_pauses_until_reset():
+    limiter = RateLimiter(delay_seconds=0, max_concurrent=2)
+    limiter.observe_limits(remaining=100, reset=None)
+    limiter.observe_limits(remaining=5, reset=0.1)
+    assert limiter.quota_slowdowns == 1
+    assert limiter.backoff_count == 0
+    start = monotonic()
+    await limiter.acquire()
+    limiter.release()
+    assert monotonic() - start == pytest.approx(0.1, abs=0.05)
+
+
+def test_observe_limits_backs_off_without_reset():
+    limiter = RateLimiter(delay_seconds=0.2, max_concurrent=2)
+    limiter.observe_limits(remaining=50, reset=None)
+    assert not limiter.is_throttled
+    limiter.observe_limits(remaining=1, reset=None)
+    assert limiter.is_throttled
+    # Counted apart from 429/503 back-offs, and only when it slowed us down
+    limiter.observe_limits(remaining=1, reset=None)
+    assert limiter.quota_slowdowns == 1
+    assert limiter.backoff_count == 0
+
+
+def test_observe_limits_honors_retry_after():
+    limiter = RateLimiter(delay_seconds=0, max_concurrent=2)
+    before = monotonic()
+    limiter.observe_limits(remaining=None, reset=None, retry_after=1000)
+    # Capped at _MAX_PAUSE rather than the server's 1000 s
+    assert before + rl._MAX_PAUSE <= limiter._pause_until <= monotonic() + rl._MAX_PAUSE
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({}, (None, None)),
+        ({"x-ratelimit-remaining-requests": "7", "x-ratelimit-reset-requests": "3s"}, (7, 3.0)),
+        ({"ratelimit-remaining": "0", "ratelimit-reset": "12"}, (0, 12.0)),
+        ({"x-ratelimit-remaining": "abc", "x-ratelimit-reset": "soon"}, (None, None)),
+        ({"x-ratelimit-remaining": "inf", "x-ratelimit-reset": "inf"}, (None, None)),
+        ({"x-ratelimit-remaining": "1e400", "x-ratelimit-reset": "nan"}, (None, None)),
+    ],
+)
+def test_parse_rate_limit(headers, expected):
+    assert BaseFetcher._parse_rate_limit(headers) == expected
+
+
+def test_parse_rate_limit_epoch_reset():
+    epoch = datetime.now(timezone.utc).timestamp() + 30
+    remaining, reset = BaseFetcher._parse_rate_limit(
+        {"x-ratelimit-remaining": "3", "x-ratelimit-reset": str(epoch)}
+    )
+    assert remaining == 3
+    assert reset == pytest.approx(30, abs=2)
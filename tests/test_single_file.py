@@ -0,0 +1,31 @@
+"""Tests for single-file output section ordering."""
+
+from doc_retrieval.converter.llm_formatter import FormattedPage, SiteInfo
+from doc_retrieval.output.single_file import SingleFileOutput
+
+
+def _page(url: str, body: str) -> FormattedPage:
+    return FormattedPage(url=url, title=body, markdown=f"{body} content")
+
+
+async def test_sections_sorted_by_url_then_discovery_order(tmp_path):
+    writer = SingleFileOutput(tmp_path / "out.md", include_metadata=False, include_toc=False)
+    await writer.open()
+    # Completion order differs from both URL and discovery order
+    await writer.append(_page("https://d.example/b", "B"), order=0)
+    await writer.append(_page("https://d.example/a", "A-second"), order=2)
+    await writer.append(_page("https://d.example/a", "A-first"), order=1)
+    path = await writer.close(SiteInfo(base_url="https://d.example/"))
+
+    text = path.read_text(encoding="utf-8")
+    positions = [text.index(f"{name} content") for name in ("A-first", "A-second", "B")]
+    assert positions == sorted(positions)
+    assert not path.with_name(path.name + ".part").exists()
+
+
+async def test_abort_removes_spool(tmp_path):
+    writer = SingleFileOutput(tmp_path / "out.md")
+    await writer.append(_page("https://d.example/a", "A"))
+    await writer.abort()
+    assert not (tmp_path / "out.md").exists()
+    assert not (tmp_path / "out.md.part").exists()
@@ -0,0 +1,89 @@
+"""Tests for the URL helpers' string fast paths."""
+
+from urllib.parse import urlparse, urlunparse
+
+import pytest
+
+from doc_retrieval.utils.url_utils import (
+    SameDomainChecker,
+    get_base_domain,
+    is_doc_url,
+    is_same_domain,
+    normalize_url,
+    url_to_filename,
+)
+
+# Plain URLs take the string fast paths; the rest exercise the urlparse fallback
+URLS = [
+    "https://docs.example.com/guide/intro/",
+    "HTTPS://Docs.Example.COM/Guide/Intro",
+    "http://docs.example.com",
+    "http://docs.example.com/",
+    "https://docs.example.com/a?b=1#frag",
+    "https://docs.example.com?x=1",
+    "https://docs.example.com#top",
+    "https://user:pw@docs.example.com:8443/a/",
+    "https://docs.example.com/a;params/b",
+    "https://[::1]:8080/a/",
+    "https://docs.example.com/a b/",
+    "svn+ssh://host.example.com/repo/",
+    "mailto:someone@example.com",
+    "//docs.example.com/a/",
+    "/relative/path/",
+    "",
+]
+
+
+def _slow_normalize(url: str) -> str:
+    parsed = urlparse(url)
+    normalized = parsed._replace(netloc=parsed.netloc.lower(), fragment="")
+    path = normalized.path.rstrip("/") if normalized.path != "/" else "/"
+    return urlunparse(normalized._replace(path=path))
+
+
+@pytest.mark.parametrize("url", URLS)
+def test_get_base_domain_matches_urlparse(url):
+    assert get_base_domain(url) == urlparse(url).netloc.lower()
+
+
+@pytest.mark.parametrize("url", URLS)
+def test_normalize_url_matches_urlparse(url):
+    assert normalize_url(url) == _slow_normalize(url)
+
+
+def test_normalize_url_dedupes_case_and_trailing_slash():
+    assert normalize_url("HTTPS://Docs.Example.com/a/#x") == "https://docs.example.com/a"
+    assert normalize_url("https://docs.example.com/") == "https://docs.example.com/"
+
+
+@pytest.mark.parametrize("url", URLS)
+def test_same_domain_checker_matches_is_same_domain(url):
+    base = "https://Docs.Example.com/guide/"
+    assert SameDomainChecker(base)(url) == is_same_domain(url, base)
+
+
+def test_same_domain_checker_rejects_lookalike_hosts():
+    check = SameDomainChecker("https://docs.example.com/")
+    assert check("https://docs.example.com/a")
+    assert not check("https://docs.example.com.evil.net/a")
+    assert not check("https://docs.example.comx/a")
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("https://docs.example.com/guide/intro", True),
+        ("https://docs.example.com/logo.PNG", False),
+        ("https://docs.example.com/static/app.html", False),
+        ("https://docs.example.com/api.json", False),
+        ("https://docs.example.com/json-guide", True),
+    ],
+)
+def test_is_doc_url(url, expected):
+    assert is_doc_url(url) is expected
+
+
+def test_url_to_filename_sanitizes_and_drops_traversal():
+    base = "https://docs.example.com/"
+    assert url_to_filename("https://docs.example.com/", base) == "index.md"
+    assert url_to_filename("https://docs.example.com/a/../b:c*d", base) == "a/b_c_d.md"